@@ -8,6 +8,7 @@ __doc__ = 'Add grid bubbles and dimensions to Floor Plans and Structural Plans'
 
 import clr
 import os
+from collections import namedtuple
 clr.AddReference("RevitAPI")
 clr.AddReference("PresentationCore")
 clr.AddReference("PresentationFramework")
@@ -19,16 +20,60 @@ from pyrevit import revit, script, forms
 import System
 from System.Windows.Markup import XamlReader
 from System.Windows import Window
+from System.Windows.Threading import DispatcherPriority
 from System.IO import StreamReader
 
 doc = revit.doc
 output = script.get_output()
 
+# Views annotated per committed transaction, keeps the undo buffer small on large runs
+VIEWS_PER_COMMIT = 50
+
+# Views between status line updates during a run
+STATUS_UPDATE_INTERVAL = 10
+
+# Annotation option bits, read once from the checkboxes
+VERT_TOP = 1
+VERT_BOTTOM = 2
+HORZ_LEFT = 4
+HORZ_RIGHT = 8
+INCL_TOP = 16
+INCL_BOTTOM = 32
+GRID_DIMS = 64
+END_TO_END_DIMS = 128
+
+NEEDS_VERTICAL = VERT_TOP | VERT_BOTTOM | GRID_DIMS | END_TO_END_DIMS
+NEEDS_HORIZONTAL = HORZ_LEFT | HORZ_RIGHT | GRID_DIMS | END_TO_END_DIMS
+NEEDS_INCLINED = INCL_TOP | INCL_BOTTOM
+
+# Grid with its endpoint coordinates read once, so sorting works on plain floats
+GridEP = namedtuple("GridEP", ["grid", "x0", "y0", "x1", "y1", "is_vertical", "is_horizontal"])
+
 
 # ==============================================================================
 # HELPER FUNCTIONS
 # ==============================================================================
 
+class WarningSwallower(IFailuresPreprocessor):
+    """Delete warnings raised during the run so they do not interrupt the batch"""
+    def PreprocessFailures(self, failures_accessor):
+        for failure in failures_accessor.GetFailureMessages():
+            if failure.GetSeverity() == FailureSeverity.Warning:
+                failures_accessor.DeleteWarning(failure)
+        return FailureProcessingResult.Continue
+
+
+def start_batch_transaction(name):
+    """Start a transaction that clears failures on rollback and swallows warnings"""
+    transaction = Transaction(doc, name)
+    transaction.Start()
+    options = transaction.GetFailureHandlingOptions()
+    options.SetFailuresPreprocessor(WarningSwallower())
+    options.SetClearAfterRollback(True)
+    transaction.SetFailureHandlingOptions(options)
+    return transaction
+
+
 def get_all_grids():
     """Get all grids in the project"""
     grids = FilteredElementCollector(doc)\
@@ -72,30 +117,61 @@ def get_target_views(include_plans, include_structural_plans, active_only):
     return views
 
 
-def classify_grids_for_view(grids, view):
-    """Classify grids based on how they appear in a specific view"""
-    vertical_grids = []
-    horizontal_grids = []
-    inclined_grids = []
+def get_grid_endpoints(grids):
+    """Read each grid's endpoints and orientation once into GridEP records"""
+    records = []
 
     for grid in grids:
         try:
             curve = grid.Curve
             direction = curve.Direction
+            pt0 = curve.GetEndPoint(0)
+            pt1 = curve.GetEndPoint(1)
+        except:
+            continue
 
-            # In plan views - use X/Y components
-            angle_x = abs(direction.X)
-            angle_y = abs(direction.Y)
+        # In plan views - use X/Y components
+        is_horizontal = abs(direction.X) > 0.97  # Nearly horizontal (running east-west)
+        is_vertical = not is_horizontal and abs(direction.Y) > 0.97  # Nearly vertical (running north-south)
 
-            if angle_x > 0.97:  # Nearly horizontal (running east-west)
-                horizontal_grids.append(grid)
-            elif angle_y > 0.97:  # Nearly vertical (running north-south)
-                vertical_grids.append(grid)
-            else:  # Inclined
-                inclined_grids.append(grid)
-        except:
-            pass
+        records.append(GridEP(grid, pt0.X, pt0.Y, pt1.X, pt1.Y, is_vertical, is_horizontal))
+
+    return records
+
+
+def classify_grids(grid_records, needs_vertical=True, needs_horizontal=True, needs_inclined=True):
+    """Classify grid records as vertical, horizontal or inclined in plan"""
+    vertical_grids = []
+    horizontal_grids = []
+    inclined_grids = []
+
+    # Orientations no option uses are left empty
+    for record in grid_records:
+        if record.is_horizontal:
+            if needs_horizontal:
+                horizontal_grids.append(record)
+        elif record.is_vertical:
+            if needs_vertical:
+                vertical_grids.append(record)
+        elif needs_inclined:
+            inclined_grids.append(record)
+
+    return vertical_grids, horizontal_grids, inclined_grids
+
+
+def classify_and_sort_grids(grids, mask):
+    """Classify grids and sort each group once, ahead of any document changes"""
+    needs_vertical = bool(mask & NEEDS_VERTICAL)
+    needs_horizontal = bool(mask & NEEDS_HORIZONTAL)
+    needs_inclined = bool(mask & NEEDS_INCLINED)
 
+    # Grid curves are model geometry, so every plan view sees the same classification
+    grid_records = get_grid_endpoints(grids)
+    vertical_grids, horizontal_grids, inclined_grids = classify_grids(
+        grid_records, needs_vertical, needs_horizontal, needs_inclined)
+    vertical_grids.sort(key=lambda r: r.x0)
+    horizontal_grids.sort(key=lambda r: r.y0)
+    inclined_grids.sort(key=lambda r: r.y0)
     return vertical_grids, horizontal_grids, inclined_grids
 
 
@@ -113,8 +189,17 @@ def add_grid_head(view, grid, end_point_index):
         return False
 
 
-def create_dimension_string(view, grids, offset):
-    """Create dimension string for grids"""
+def add_grid_heads_bulk(view, pending):
+    """Add grid heads for a list of (grid, end_point_index) pairs, returns count added"""
+    added = 0
+    for grid, end_point_index in pending:
+        if add_grid_head(view, grid, end_point_index):
+            added += 1
+    return added
+
+
+def create_dimension_string(view, grids, offset, log_lines):
+    """Create dimension string for grids, errors go to the view's log_lines"""
     try:
         if len(grids) < 2:
             return None
@@ -157,12 +242,12 @@ def create_dimension_string(view, grids, offset):
         dimension = doc.Create.NewDimension(view, dim_line, refs)
         return dimension
     except Exception as e:
-        output.print_md("  Dimension error: {}".format(str(e)))
+        log_lines.append("  Dimension error: {}".format(str(e)))
         return None
 
 
-def create_end_to_end_dimension(view, grids, offset):
-    """Create end-to-end dimension (only first and last grid)"""
+def create_end_to_end_dimension(view, grids, offset, log_lines):
+    """Create end-to-end dimension (only first and last grid), errors go to the view's log_lines"""
     try:
         if len(grids) < 2:
             return None
@@ -199,22 +284,90 @@ def create_end_to_end_dimension(view, grids, offset):
         dimension = doc.Create.NewDimension(view, dim_line, refs)
         return dimension
     except Exception as e:
-        output.print_md("  End-to-end error: {}".format(str(e)))
+        log_lines.append("  End-to-end error: {}".format(str(e)))
         return None
 
 
+def annotate_view(view, classified_grids, mask, first_offset, second_offset, log_lines):
+    """
+    Add bubbles and dimensions to a single view, returns (bubbles, dimensions).
+    Dimension errors are appended to log_lines under the view's header
+    """
+    vertical_records, horizontal_records, inclined_records = classified_grids
+    if not (vertical_records or horizontal_records or inclined_records):
+        return 0, 0
+
+    vertical_grids = [r.grid for r in vertical_records]
+    horizontal_grids = [r.grid for r in horizontal_records]
+
+    view_dimensions = 0
+    pending = []
+
+    # Bubbles for vertical grids
+    if mask & (VERT_TOP | VERT_BOTTOM) and vertical_grids:
+        for grid in vertical_grids:
+            if mask & VERT_TOP:
+                pending.append((grid, 1))
+            if mask & VERT_BOTTOM:
+                pending.append((grid, 0))
+
+    # Bubbles for horizontal grids
+    if mask & (HORZ_LEFT | HORZ_RIGHT) and horizontal_grids:
+        for grid in horizontal_grids:
+            if mask & HORZ_LEFT:
+                pending.append((grid, 0))
+            if mask & HORZ_RIGHT:
+                pending.append((grid, 1))
+
+    # Bubbles for inclined grids
+    if mask & NEEDS_INCLINED and inclined_records:
+        for record in inclined_records:
+            top_end = 0 if record.y0 > record.y1 else 1
+            bottom_end = 1 - top_end
+
+            if mask & INCL_TOP:
+                pending.append((record.grid, top_end))
+            if mask & INCL_BOTTOM:
+                pending.append((record.grid, bottom_end))
+
+    # Add all bubbles for the view in one pass
+    view_bubbles = add_grid_heads_bulk(view, pending)
+
+    # Add dimensions
+    if mask & GRID_DIMS:
+        if len(vertical_grids) >= 2:
+            if create_dimension_string(view, vertical_grids, first_offset, log_lines):
+                view_dimensions += 1
+        if len(horizontal_grids) >= 2:
+            if create_dimension_string(view, horizontal_grids, first_offset, log_lines):
+                view_dimensions += 1
+
+    # Add end-to-end dimensions
+    if mask & END_TO_END_DIMS:
+        if len(vertical_grids) >= 2:
+            if create_end_to_end_dimension(view, vertical_grids, second_offset, log_lines):
+                view_dimensions += 1
+        if len(horizontal_grids) >= 2:
+            if create_end_to_end_dimension(view, horizontal_grids, second_offset, log_lines):
+                view_dimensions += 1
+
+    return view_bubbles, view_dimensions
+
+
 # ==============================================================================
 # WPF WINDOW CLASS
 # ==============================================================================
 
 class GridAnnotationWindow(Window):
-    def __init__(self, xaml_path, document):
+    def __init__(self, xaml_path, document, grids):
         stream = StreamReader(xaml_path)
         self._window = XamlReader.Load(stream.BaseStream)
         stream.Close()
         
         self.doc = document
+        self.all_grids = grids
         self.result = False
+        self.running = False
         
         # Get controls
         self.btnClose = self._window.FindName("btnClose")
@@ -235,10 +388,13 @@ class GridAnnotationWindow(Window):
         self.btnAnnotateSelected = self._window.FindName("btnAnnotateSelected")
         self.btnAnnotateAll = self._window.FindName("btnAnnotateAll")
         
+        self.txtStatus.Text = "Found {} grids - configure options and click Annotate".format(len(grids))
+        
         self.SetupEventHandlers()
     
     def SetupEventHandlers(self):
         self.btnClose.Click += self.OnClose
+        self._window.Closing += self.OnClosing
         self.btnAnnotateSelected.Click += self.OnAnnotateSelected
         self.btnAnnotateAll.Click += self.OnAnnotateAll
         self.chkActiveViewOnly.Checked += self.OnActiveViewOnlyChanged
@@ -248,6 +404,11 @@ class GridAnnotationWindow(Window):
         self._window.DialogResult = False
         self._window.Close()
     
+    def OnClosing(self, sender, args):
+        # The title bar close button stays live while a run pumps the dispatcher
+        if self.running:
+            args.Cancel = True
+    
     def OnActiveViewOnlyChanged(self, sender, args):
         is_active_only = self.chkActiveViewOnly.IsChecked
         self.chkAllPlanViews.IsEnabled = not is_active_only
@@ -259,24 +420,32 @@ class GridAnnotationWindow(Window):
     def OnAnnotateAll(self, sender, args):
         self.ProcessAnnotation(active_only=False)
     
+    def SetStatus(self, text):
+        """Update the status line and let WPF render it while a run is in progress"""
+        self.txtStatus.Text = text
+        self._window.Dispatcher.Invoke(System.Action(lambda: None), DispatcherPriority.Background)
+    
+    def ReadOptionMask(self):
+        """Pack the annotation checkboxes into a bitmask before the run starts"""
+        return ((VERT_TOP if self.chkVerticalTop.IsChecked else 0) |
+                (VERT_BOTTOM if self.chkVerticalBottom.IsChecked else 0) |
+                (HORZ_LEFT if self.chkHorizontalLeft.IsChecked else 0) |
+                (HORZ_RIGHT if self.chkHorizontalRight.IsChecked else 0) |
+                (INCL_TOP if self.chkInclinedTop.IsChecked else 0) |
+                (INCL_BOTTOM if self.chkInclinedBottom.IsChecked else 0) |
+                (GRID_DIMS if self.chkIncludeDimensions.IsChecked else 0) |
+                (END_TO_END_DIMS if self.chkEndToEndDimensions.IsChecked else 0))
+    
     def ProcessAnnotation(self, active_only):
         # Get settings
-        vertical_top = self.chkVerticalTop.IsChecked
-        vertical_bottom = self.chkVerticalBottom.IsChecked
-        horizontal_left = self.chkHorizontalLeft.IsChecked
-        horizontal_right = self.chkHorizontalRight.IsChecked
-        inclined_top = self.chkInclinedTop.IsChecked
-        inclined_bottom = self.chkInclinedBottom.IsChecked
-        include_dimensions = self.chkIncludeDimensions.IsChecked
-        include_end_to_end = self.chkEndToEndDimensions.IsChecked
+        mask = self.ReadOptionMask()
 
         # Use fixed offset values
         first_offset = -10.0  # Grid-to-grid dimensions (10 ft away)
         second_offset = -20.0  # End-to-end dimensions (20 ft away)
 
         # Check if any option is selected
-        if not any([vertical_top, vertical_bottom, horizontal_left, horizontal_right,
-                   inclined_top, inclined_bottom, include_dimensions, include_end_to_end]):
+        if mask == 0:
             forms.alert("Please select at least one option", title="Validation Error")
             return
 
@@ -299,99 +468,96 @@ class GridAnnotationWindow(Window):
         if not forms.alert(confirm_msg, yes=True, no=True, title="Confirm"):
             return
         
-        # Update UI
-        self.btnAnnotateAll.IsEnabled = False
-        self.btnAnnotateSelected.IsEnabled = False
-        self.btnAnnotateAll.Content = "PROCESSING..."
-        
-        # Get all grids
-        all_grids = get_all_grids()
+        # Grids were collected when the dialog opened
+        all_grids = self.all_grids
         
         if not all_grids:
             forms.alert("No grids found in project", title="Error")
-            self.btnAnnotateAll.IsEnabled = True
-            self.btnAnnotateSelected.IsEnabled = True
-            self.btnAnnotateAll.Content = "ANNOTATE ALL"
             return
         
+        # SetStatus pumps the dispatcher, so keep the window from closing or starting
+        # a second run while the transactions are open
+        self.SetRunning(True)
+        try:
+            self.RunAnnotation(views, all_grids, mask, first_offset, second_offset)
+        finally:
+            self.SetRunning(False)
+        
+        if self.result:
+            self._window.Close()
+    
+    def SetRunning(self, running):
+        """Disable the run and close buttons while an annotation run is in progress"""
+        self.running = running
+        self.btnClose.IsEnabled = not running
+        self.btnAnnotateAll.IsEnabled = not running
+        self.btnAnnotateSelected.IsEnabled = not running
+        self.btnAnnotateAll.Content = "PROCESSING..." if running else "ANNOTATE ALL"
+    
+    def RunAnnotation(self, views, all_grids, mask, first_offset, second_offset):
         output.print_md("### Grid Annotation")
         output.print_md("**Grids**: {}".format(len(all_grids)))
         output.print_md("**Views**: {}".format(len(views)))
         
+        # Read-only setup before the transaction; only the writes below run per view
+        classified_grids = classify_and_sort_grids(all_grids, mask)
+        
         views_processed = 0
         bubbles_added = 0
         dimensions_added = 0
         errors = 0
+        total_views = len(views)
+        log_lines = []
         
-        with revit.Transaction("Add Grid Annotations"):
-            for view in views:
-                try:
-                    output.print_md("**{}**: {}".format(view.Name, view.ViewType))
-                    
-                    vertical_grids, horizontal_grids, inclined_grids = classify_grids_for_view(all_grids, view)
-                    vertical_grids.sort(key=lambda g: g.Curve.GetEndPoint(0).X)
-                    horizontal_grids.sort(key=lambda g: g.Curve.GetEndPoint(0).Y)
-                    inclined_grids.sort(key=lambda g: g.Curve.GetEndPoint(0).Y)
-                    
-                    view_bubbles = 0
-                    view_dimensions = 0
-                    
-                    # Add bubbles for vertical grids
-                    if (vertical_top or vertical_bottom) and vertical_grids:
-                        for grid in vertical_grids:
-                            if vertical_top and add_grid_head(view, grid, 1):
-                                view_bubbles += 1
-                            if vertical_bottom and add_grid_head(view, grid, 0):
-                                view_bubbles += 1
-                    
-                    # Add bubbles for horizontal grids
-                    if (horizontal_left or horizontal_right) and horizontal_grids:
-                        for grid in horizontal_grids:
-                            if horizontal_left and add_grid_head(view, grid, 0):
-                                view_bubbles += 1
-                            if horizontal_right and add_grid_head(view, grid, 1):
-                                view_bubbles += 1
-                    
-                    # Add bubbles for inclined grids
-                    if (inclined_top or inclined_bottom) and inclined_grids:
-                        for grid in inclined_grids:
-                            pt0 = grid.Curve.GetEndPoint(0)
-                            pt1 = grid.Curve.GetEndPoint(1)
-                            top_end = 0 if pt0.Y > pt1.Y else 1
-                            bottom_end = 1 if pt0.Y > pt1.Y else 0
-                            
-                            if inclined_top and add_grid_head(view, grid, top_end):
-                                view_bubbles += 1
-                            if inclined_bottom and add_grid_head(view, grid, bottom_end):
-                                view_bubbles += 1
-                    
-                    # Add dimensions
-                    if include_dimensions:
-                        if len(vertical_grids) >= 2:
-                            if create_dimension_string(view, vertical_grids, first_offset):
-                                view_dimensions += 1
-                        if len(horizontal_grids) >= 2:
-                            if create_dimension_string(view, horizontal_grids, first_offset):
-                                view_dimensions += 1
-                    
-                    # Add end-to-end dimensions
-                    if include_end_to_end:
-                        if len(vertical_grids) >= 2:
-                            if create_end_to_end_dimension(view, vertical_grids, second_offset):
-                                view_dimensions += 1
-                        if len(horizontal_grids) >= 2:
-                            if create_end_to_end_dimension(view, horizontal_grids, second_offset):
-                                view_dimensions += 1
+        with revit.TransactionGroup("Add Grid Annotations"):
+            transaction = None
+            views_since_commit = 0
+            
+            try:
+                for index, view in enumerate(views, 1):
+                    if transaction is None:
+                        transaction = start_batch_transaction("Add Grid Annotations")
                     
-                    bubbles_added += view_bubbles
-                    dimensions_added += view_dimensions
-                    views_processed += 1
+                    if index == 1 or index % STATUS_UPDATE_INTERVAL == 0:
+                        self.SetStatus("Annotating view {} of {}...".format(index, total_views))
+                    log_lines.append("**{}**: {}".format(view.Name, view.ViewType))
                     
-                    output.print_md("  ✓ {} bubbles, {} dims".format(view_bubbles, view_dimensions))
+                    # Each view gets its own sub-transaction so a failure only rolls back that view
+                    sub_transaction = SubTransaction(doc)
+                    sub_transaction.Start()
+                    try:
+                        view_bubbles, view_dimensions = annotate_view(
+                            view, classified_grids, mask, first_offset, second_offset, log_lines)
+                        sub_transaction.Commit()
+                        
+                        bubbles_added += view_bubbles
+                        dimensions_added += view_dimensions
+                        views_processed += 1
+                        
+                        log_lines.append("  ✓ {} bubbles, {} dims".format(view_bubbles, view_dimensions))
+                        
+                    except Exception as e:
+                        sub_transaction.RollBack()
+                        log_lines.append("  ✗ Error: {}".format(str(e)))
+                        errors += 1
                     
-                except Exception as e:
-                    output.print_md("  ✗ Error: {}".format(str(e)))
-                    errors += 1
+                    # Commit and restart the transaction every VIEWS_PER_COMMIT views
+                    views_since_commit += 1
+                    if views_since_commit >= VIEWS_PER_COMMIT:
+                        transaction.Commit()
+                        transaction = None
+                        views_since_commit = 0
+                
+                if transaction is not None:
+                    transaction.Commit()
+                    transaction = None
+            finally:
+                # An exception mid-batch must not leave the batch transaction open
+                if transaction is not None and transaction.HasStarted():
+                    transaction.RollBack()
+        
+        # Write the per-view log in one go rather than once per view
+        output.print_md("\n\n".join(log_lines))
         
         summary = "Complete!\n\nViews: {}\nBubbles: {}\nDimensions: {}".format(
             views_processed, bubbles_added, dimensions_added)
@@ -404,7 +570,6 @@ class GridAnnotationWindow(Window):
         output.print_md("**Dimensions**: {}".format(dimensions_added))
         
         self.result = True
-        self._window.Close()
     
     def ShowDialog(self):
         return self._window.ShowDialog()
@@ -425,9 +590,8 @@ if not os.path.exists(xaml_path):
     )
 
 grids = get_all_grids()
-output.print_md("**Found {} grids**".format(len(grids)))
 
-window = GridAnnotationWindow(xaml_path, doc)
+window = GridAnnotationWindow(xaml_path, doc, grids)
 window.ShowDialog()
 
 if window.result:
@@ -8,6 +8,7 @@ __doc__ = 'Create assemblies from walls with hosted elements'
 
 import clr
 import os
+import sys
 clr.AddReference("RevitAPI")
 clr.AddReference("RevitAPIUI")
 clr.AddReference("PresentationCore")
@@ -21,25 +22,140 @@ from pyrevit import script, forms
 import System
 from System.Windows.Markup import XamlReader
 from System.Windows import Window
+from System.Windows.Controls import DataGridEditingUnit
+from System.Windows.Threading import DispatcherTimer
+from System.Windows.Data import CollectionViewSource
 from System.IO import StreamReader
 from System.Collections.ObjectModel import ObservableCollection
+from System.Collections.Generic import List
 from collections import defaultdict
 
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
 output = script.get_output()
 
+# Dependent elements of a wall that count as hosted (mullions are not plain FamilyInstances)
+HOSTED_ELEMENTS_FILTER = LogicalOrFilter(
+    ElementClassFilter(FamilyInstance),
+    ElementMulticategoryFilter(List[BuiltInCategory]([
+        BuiltInCategory.OST_Doors,
+        BuiltInCategory.OST_Windows,
+        BuiltInCategory.OST_GenericModel,
+        BuiltInCategory.OST_CurtainWallMullions,
+    ]))
+)
+
+# Delay after the last keystroke before a filter box refreshes its list
+FILTER_DEBOUNCE_MS = 150
+
+# intern() lives in sys on Python 3 and is a builtin on IronPython 2.7
+intern_string = getattr(sys, "intern", None) or intern
+
+# Spatial index cell size in feet (about one typical wall length) and the cell count
+# above which an element is treated as oversized and checked against every wall
+SPATIAL_CELL_SIZE = 20.0
+SPATIAL_MAX_CELLS = 400
+
+# AppDomain data slot prefix for decoded logos; scripts get a fresh module per run,
+# the AppDomain lives as long as Revit
+LOGO_CACHE_KEY = "BA_Tools.Logo."
+
+
+# ==============================================================================
+# HELPER FUNCTIONS
+# ==============================================================================
+
+def bounding_boxes_overlap(bb1, bb2):
+    """Check whether two BoundingBoxXYZ boxes overlap"""
+    return (bb1.Min.X <= bb2.Max.X and bb2.Min.X <= bb1.Max.X and
+            bb1.Min.Y <= bb2.Max.Y and bb2.Min.Y <= bb1.Max.Y and
+            bb1.Min.Z <= bb2.Max.Z and bb2.Min.Z <= bb1.Max.Z)
+
+
+def get_builtin_parameters(element):
+    """Index an element's parameters by BuiltInParameter in a single pass"""
+    params = {}
+    for param in element.GetOrderedParameters():
+        try:
+            params[param.Definition.BuiltInParameter] = param
+        except:
+            pass
+    return params
+
+
+def get_covered_cells(bbox, cell_size):
+    """Get the spatial index cells covered by the XY footprint of a bounding box"""
+    min_i = int(bbox.Min.X // cell_size)
+    max_i = int(bbox.Max.X // cell_size)
+    min_j = int(bbox.Min.Y // cell_size)
+    max_j = int(bbox.Max.Y // cell_size)
+    return [(i, j) for i in range(min_i, max_i + 1) for j in range(min_j, max_j + 1)]
+
+
+def build_spatial_index(elements, cell_size):
+    """Bucket element ids by bounding box footprint, returns (cells, oversized_ids)"""
+    cells = defaultdict(set)
+    oversized_ids = set()
+    
+    for el in elements:
+        try:
+            bbox = el.get_BoundingBox(None)
+        except:
+            continue
+        if not bbox:
+            continue
+        
+        el_id_int = el.Id.IntegerValue
+        covered = get_covered_cells(bbox, cell_size)
+        if len(covered) > SPATIAL_MAX_CELLS:
+            oversized_ids.add(el_id_int)
+            continue
+        
+        for cell in covered:
+            cells[cell].add(el_id_int)
+    
+    return cells, oversized_ids
+
+
+def commit_grid_edit(grid):
+    """End a pending checkbox edit so the grid's view can be refreshed or filtered"""
+    if not grid.CommitEdit(DataGridEditingUnit.Row, True):
+        grid.CancelEdit(DataGridEditingUnit.Row)
+
+
+def load_logo(script_dir):
+    """Get the frozen BA logo bitmap, decoding it only once per Revit session"""
+    import System.Windows.Media.Imaging as Imaging
+    
+    logo_path = os.path.join(script_dir, "BA_logo.png")
+    if not os.path.exists(logo_path):
+        logo_path = os.path.join(script_dir, "icon.png")
+    
+    domain = System.AppDomain.CurrentDomain
+    bitmap = domain.GetData(LOGO_CACHE_KEY + logo_path)
+    if bitmap is None and os.path.exists(logo_path):
+        bitmap = Imaging.BitmapImage()
+        bitmap.BeginInit()
+        bitmap.UriSource = System.Uri(logo_path)
+        bitmap.CacheOption = Imaging.BitmapCacheOption.OnLoad
+        bitmap.EndInit()
+        bitmap.Freeze()
+        domain.SetData(LOGO_CACHE_KEY + logo_path, bitmap)
+    return bitmap
+
 
 # ==============================================================================
 # DATA CLASSES
 # ==============================================================================
 
-class CommentGroup:
+class CommentGroup(System.ComponentModel.INotifyPropertyChanged):
     """Represents a group of walls with the same comment"""
     def __init__(self, comment, count):
-        self.Comment = comment if comment else "<No Comment>"
+        self.Comment = intern_string(comment if comment else "<No Comment>")
+        self._comment_lc = self.Comment.lower()
         self.Count = count
         self._isSelected = False
+        self._property_changed = None
     
     @property
     def IsSelected(self):
@@ -47,36 +163,101 @@ class CommentGroup:
     
     @IsSelected.setter
     def IsSelected(self, value):
-        self._isSelected = value
+        if self._isSelected != value:
+            self._isSelected = value
+            self.OnPropertyChanged("IsSelected")
+    
+    def add_PropertyChanged(self, handler):
+        self._property_changed = System.Delegate.Combine(self._property_changed, handler)
+    
+    def remove_PropertyChanged(self, handler):
+        self._property_changed = System.Delegate.Remove(self._property_changed, handler)
+    
+    def OnPropertyChanged(self, property_name):
+        if self._property_changed:
+            args = System.ComponentModel.PropertyChangedEventArgs(property_name)
+            self._property_changed(self, args)
 
 
-class WallData:
+class WallData(System.ComponentModel.INotifyPropertyChanged):
     """Represents a wall with its properties"""
+    # Names shared by many walls, keyed by ElementId.IntegerValue
+    _wall_type_name_cache = {}
+    _level_name_cache = {}
+    
+    # All model elements and their spatial index for the deep scan, built on first use
+    _all_instances = None
+    _spatial_index = None
+    
+    @classmethod
+    def GetAllInstances(cls):
+        """Get the shared list of all non-type elements in the model"""
+        if cls._all_instances is None:
+            cls._all_instances = list(FilteredElementCollector(doc).WhereElementIsNotElementType())
+        return cls._all_instances
+    
+    @classmethod
+    def GetSpatialIndex(cls):
+        """Get the shared (cells, oversized_ids) spatial index of model elements"""
+        if cls._spatial_index is None:
+            cls._spatial_index = build_spatial_index(cls.GetAllInstances(), SPATIAL_CELL_SIZE)
+        return cls._spatial_index
+    
+    def GetIntersectionCandidates(self, wall_bbox):
+        """Get ids of elements sharing a spatial index cell with the wall"""
+        cells, oversized_ids = WallData.GetSpatialIndex()
+        candidates = set(oversized_ids)
+        for cell in get_covered_cells(wall_bbox, SPATIAL_CELL_SIZE):
+            candidates.update(cells.get(cell, ()))
+        return candidates
+    
     def __init__(self, wall):
         self.Wall = wall
         self.WallId = str(wall.Id.IntegerValue)
         self._isSelected = False
+        self._property_changed = None
+        
+        params = get_builtin_parameters(wall)
         
         # Get wall comment
-        comment_param = wall.get_Parameter(BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS)
-        self.Comment = comment_param.AsString() if comment_param and comment_param.AsString() else "<No Comment>"
+        comment_param = params.get(BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS)
+        comment = comment_param.AsString() if comment_param else None
+        self.Comment = intern_string(comment or "<No Comment>")
         
         # Get wall type
-        wall_type = doc.GetElement(wall.GetTypeId())
-        self.WallType = wall_type.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM).AsString() if wall_type else "Unknown"
+        type_id = wall.GetTypeId().IntegerValue
+        type_name = WallData._wall_type_name_cache.get(type_id)
+        if type_name is None:
+            wall_type = doc.GetElement(wall.GetTypeId())
+            type_name = wall_type.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM).AsString() if wall_type else "Unknown"
+            WallData._wall_type_name_cache[type_id] = type_name
+        self.WallType = type_name
         
         # Get level
-        level_param = wall.get_Parameter(BuiltInParameter.WALL_BASE_CONSTRAINT)
-        self.Level = level_param.AsValueString() if level_param else "Unknown"
+        level_param = params.get(BuiltInParameter.WALL_BASE_CONSTRAINT)
+        if level_param:
+            level_id = level_param.AsElementId().IntegerValue
+            level_name = WallData._level_name_cache.get(level_id)
+            if level_name is None:
+                level_name = level_param.AsValueString()
+                WallData._level_name_cache[level_id] = level_name
+            self.Level = level_name
+        else:
+            self.Level = "Unknown"
         
         # Get length in meters
-        length_param = wall.get_Parameter(BuiltInParameter.CURVE_ELEM_LENGTH)
+        length_param = params.get(BuiltInParameter.CURVE_ELEM_LENGTH)
         if length_param:
             length_ft = length_param.AsDouble()
             self.Length = "{:.2f}".format(length_ft * 0.3048)
         else:
             self.Length = "0.00"
         
+        # Lowercase search fields, computed once for the grid filter
+        self._wallid_lc = self.WallId.lower()
+        self._walltype_lc = self.WallType.lower()
+        self._level_lc = self.Level.lower()
+        
         # Count hosted elements
         self.HostedCount = self.CountHostedElements()
     
@@ -86,19 +267,57 @@ class WallData:
     
     @IsSelected.setter
     def IsSelected(self, value):
-        self._isSelected = value
+        if self._isSelected != value:
+            self._isSelected = value
+            self.OnPropertyChanged("IsSelected")
+    
+    def add_PropertyChanged(self, handler):
+        self._property_changed = System.Delegate.Combine(self._property_changed, handler)
+    
+    def remove_PropertyChanged(self, handler):
+        self._property_changed = System.Delegate.Remove(self._property_changed, handler)
+    
+    def OnPropertyChanged(self, property_name):
+        if self._property_changed:
+            args = System.ComponentModel.PropertyChangedEventArgs(property_name)
+            self._property_changed(self, args)
     
     def CountHostedElements(self):
+        """
+        Count elements hosted on this wall from its dependent elements.
+        Walls without any fall back to the geometry scan, so intersecting and cutting
+        elements that CreateAssemblies adds are still counted
+        """
+        wall_id_int = self.Wall.Id.IntegerValue
+        try:
+            dependent_ids = self.Wall.GetDependentElements(HOSTED_ELEMENTS_FILTER)
+            hosted_ids = set(i.IntegerValue for i in dependent_ids if i.IntegerValue != wall_id_int)
+        except:
+            hosted_ids = set()
+        
+        if not hosted_ids:
+            return self.CountHostedElementsDeep()
+        
+        return len(hosted_ids)
+    
+    def CountHostedElementsDeep(self):
         """Count elements hosted on this wall - using comprehensive detection"""
         count = 0
         try:
             wall_solid = None
+            wall_bbox = self.Wall.get_BoundingBox(None)
+            candidate_ids = self.GetIntersectionCandidates(wall_bbox) if wall_bbox else None
+            
+            opt = Options()
+            opt.ComputeReferences = True
+            opt.DetailLevel = ViewDetailLevel.Fine
+            
+            el_opt = Options()
+            el_opt.ComputeReferences = True
+            el_opt.DetailLevel = ViewDetailLevel.Fine
             
             # Try to get solid geometry
             try:
-                opt = Options()
-                opt.ComputeReferences = True
-                opt.DetailLevel = ViewDetailLevel.Fine
                 geo = self.Wall.get_Geometry(opt)
                 
                 if geo:
@@ -109,12 +328,16 @@ class WallData:
             except:
                 pass
             
-            # Collect all non-type elements
-            collector = FilteredElementCollector(doc).WhereElementIsNotElementType()
+            # All dependents of the wall, resolved once instead of per candidate element
+            try:
+                wall_dependent_ids = set(i.IntegerValue for i in self.Wall.GetDependentElements(None))
+            except:
+                wall_dependent_ids = set()
             
             found_ids = set()
             
-            for el in collector:
+            # All non-type elements, collected once for every wall
+            for el in WallData.GetAllInstances():
                 if el.Id == self.Wall.Id:
                     continue
                 
@@ -148,8 +371,7 @@ class WallData:
                     if el.Category:
                         cat_name = el.Category.Name
                         if cat_name in ["Doors", "Windows", "Generic Models", "Curtain Wall Mullions"]:
-                            dependent_ids = self.Wall.GetDependentElements(None)
-                            if el.Id in dependent_ids:
+                            if el_id_int in wall_dependent_ids:
                                 found_ids.add(el_id_int)
                                 count += 1
                                 continue
@@ -158,10 +380,15 @@ class WallData:
                 
                 # Method 4: Geometry intersection (only if wall has solid)
                 if wall_solid and el_id_int not in found_ids:
+                    if candidate_ids is not None and el_id_int not in candidate_ids:
+                        continue
                     try:
-                        el_opt = Options()
-                        el_opt.ComputeReferences = True
-                        el_opt.DetailLevel = ViewDetailLevel.Fine
+                        # Cheap bounding box check before parsing geometry
+                        if wall_bbox:
+                            el_bbox = el.get_BoundingBox(None)
+                            if not el_bbox or not bounding_boxes_overlap(wall_bbox, el_bbox):
+                                continue
+                        
                         el_geo = el.get_Geometry(el_opt)
                         
                         if el_geo:
@@ -223,6 +450,31 @@ class AssemblyCreationWindow(Window):
         # Store original comment list
         self.all_comment_groups = []
         
+        # Comment rows, bound once; filtering goes through the default view's Filter
+        self._comments_view = ObservableCollection[object]()
+        self.lstComments.ItemsSource = self._comments_view
+        
+        # Hosted element ids keyed by host element id, built in CreateAssemblies
+        self._by_host = defaultdict(list)
+        
+        # Last applied filter texts, to skip refreshes that would not change anything
+        self._last_filter_text = ""
+        self._last_search_text = ""
+        
+        # Rows shown in the walls grid; bound once and refilled in place
+        self._walls_view = ObservableCollection[object]()
+        self.dgWalls.ItemsSource = self._walls_view
+        
+        # Selected walls among the grid rows, kept up to date from IsSelected changes
+        self._selected_count = 0
+        
+        # Set while a selection count update is queued on the dispatcher
+        self._count_pending = False
+        
+        # Debounce timers so a burst of keystrokes triggers a single refresh
+        self._comment_filter_timer = self.CreateDebounceTimer(self.RefreshCommentList)
+        self._search_timer = self.CreateDebounceTimer(self.RefreshWallsGrid)
+        
         # Setup
         self.LoadLogo()
         self.LoadComments()
@@ -231,21 +483,23 @@ class AssemblyCreationWindow(Window):
         # Disable Create button initially
         self.btnCreateAssemblies.IsEnabled = False
     
+    def CreateDebounceTimer(self, callback):
+        """Create a timer that runs callback once typing pauses"""
+        timer = DispatcherTimer()
+        timer.Interval = System.TimeSpan.FromMilliseconds(FILTER_DEBOUNCE_MS)
+        
+        def on_tick(sender, args):
+            timer.Stop()
+            callback()
+        
+        timer.Tick += on_tick
+        return timer
+    
     def LoadLogo(self):
         """Load BA logo"""
         try:
-            import System.Windows.Media.Imaging as Imaging
-            
-            logo_path = os.path.join(self.script_dir, "BA_logo.png")
-            if not os.path.exists(logo_path):
-                logo_path = os.path.join(self.script_dir, "icon.png")
-            
-            if os.path.exists(logo_path):
-                bitmap = Imaging.BitmapImage()
-                bitmap.BeginInit()
-                bitmap.UriSource = System.Uri(logo_path)
-                bitmap.CacheOption = Imaging.BitmapCacheOption.OnLoad
-                bitmap.EndInit()
+            bitmap = load_logo(self.script_dir)
+            if bitmap is not None:
                 self.imgLogo.Source = bitmap
         except:
             pass
@@ -259,20 +513,20 @@ class AssemblyCreationWindow(Window):
         
         collector = FilteredElementCollector(doc)\
             .OfCategory(BuiltInCategory.OST_Walls)\
-            .WhereElementIsNotElementType()
+            .WhereElementIsNotElementType()\
+            .ToElements()
+        
+        # Resolve the parameter enum once instead of on every wall
+        comments_param = BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS
         
         for wall in collector:
+            # A missing parameter raises on AsString and falls back to no comment
             try:
-                # Get comment parameter
-                comment_param = wall.get_Parameter(BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS)
-                comment = comment_param.AsString() if comment_param else ""
-                
-                if not comment:
-                    comment = "<No Comment>"
-                
-                walls_by_comment[comment].append(wall)
+                comment = wall.get_Parameter(comments_param).AsString()
             except:
-                continue
+                comment = None
+            
+            walls_by_comment[intern_string(comment or "<No Comment>")].append(wall)
         
         # Store for later use
         self.comment_groups = walls_by_comment
@@ -283,28 +537,35 @@ class AssemblyCreationWindow(Window):
             comment_list.append(CommentGroup(comment, len(walls)))
         
         self.all_comment_groups = comment_list
-        self.lstComments.ItemsSource = comment_list
+        self._comments_view.Clear()
+        for comment_group in comment_list:
+            self._comments_view.Add(comment_group)
         
         self.txtStatus.Text = "Found {} unique comment values".format(len(comment_list))
     
     def RefreshCommentList(self):
         """Refresh comment list based on filter"""
         filter_text = self.txtCommentFilter.Text.lower() if self.txtCommentFilter.Text else ""
+        self._last_filter_text = filter_text
         
+        # Hide non-matching rows in place instead of rebuilding the list;
+        # the filter cannot change while an item edit is still open
+        view = CollectionViewSource.GetDefaultView(self._comments_view)
+        if view.IsAddingNew:
+            view.CommitNew()
+        if view.IsEditingItem:
+            view.CommitEdit()
         if filter_text:
-            filtered = [c for c in self.all_comment_groups 
-                       if filter_text in c.Comment.lower()]
+            view.Filter = System.Predicate[object](lambda c: filter_text in c._comment_lc)
         else:
-            filtered = self.all_comment_groups
-        
-        self.lstComments.ItemsSource = ObservableCollection[object](filtered)
+            view.Filter = None
     
     def LoadWallsForComment(self):
         """Load walls for selected comments (can be multiple)"""
         # Get selected comments
         selected_comments = []
-        if self.lstComments.ItemsSource:
-            for item in self.lstComments.ItemsSource:
+        if self.lstComments.Items.Count:
+            for item in self.lstComments.Items:
                 if item.IsSelected:
                     selected_comments.append(item.Comment)
         
@@ -324,6 +585,7 @@ class AssemblyCreationWindow(Window):
         self.current_walls = []
         for wall in all_walls:
             wall_data = WallData(wall)
+            wall_data.PropertyChanged += self.OnWallSelectionChanged
             self.current_walls.append(wall_data)
         
         # Update grid
@@ -348,34 +610,41 @@ class AssemblyCreationWindow(Window):
     def RefreshWallsGrid(self):
         """Refresh the walls DataGrid"""
         search_text = self.txtSearch.Text.lower() if self.txtSearch.Text else ""
+        self._last_search_text = search_text
         
         if search_text:
             filtered = [w for w in self.current_walls 
-                       if search_text in w.WallId.lower() 
-                       or search_text in w.WallType.lower()
-                       or search_text in w.Level.lower()]
+                       if search_text in w._wallid_lc 
+                       or search_text in w._walltype_lc
+                       or search_text in w._level_lc]
         else:
             filtered = self.current_walls
         
-        # Fix: Use proper ObservableCollection without type parameter
-        from System.Collections.ObjectModel import ObservableCollection
-        collection = ObservableCollection[object]()
-        for wall in filtered:
-            collection.Add(wall)
+        # The debounce can fire while a checkbox edit is open, which DeferRefresh rejects
+        commit_grid_edit(self.dgWalls)
         
-        self.dgWalls.ItemsSource = collection
+        # Refill the bound collection under a deferred refresh so the grid
+        # re-evaluates its rows once instead of once per added wall
+        view = CollectionViewSource.GetDefaultView(self._walls_view)
+        defer = view.DeferRefresh()
+        try:
+            self._walls_view.Clear()
+            for wall in filtered:
+                self._walls_view.Add(wall)
+        finally:
+            defer.Dispose()
+        
+        # The rows changed, so recount once; edits adjust the count from here on
+        self._selected_count = sum(1 for w in filtered if w.IsSelected)
         self.UpdateSelectionCount()
     
     def UpdateSelectionCount(self):
         """Update selected walls count"""
-        if self.dgWalls.ItemsSource:
-            selected = sum(1 for w in self.dgWalls.ItemsSource if w.IsSelected)
-            self.txtSelectedWallCount.Text = "{} selected".format(selected)
-        else:
-            self.txtSelectedWallCount.Text = "0 selected"
+        self.txtSelectedWallCount.Text = "{} selected".format(self._selected_count)
     
     def get_solid(self, element):
         """Get solid geometry from element"""
+        solid = None
         try:
             opt = Options()
             opt.ComputeReferences = True
@@ -385,10 +654,42 @@ class AssemblyCreationWindow(Window):
             if geo:
                 for g in geo:
                     if isinstance(g, Solid) and g.Volume > 0:
-                        return g
+                        solid = g
+                        break
         except:
             pass
-        return None
+        
+        return solid
+    
+    def BuildHostIndex(self, all_elements):
+        """Index element ids by the id of their host and host face elements"""
+        self._by_host = defaultdict(list)
+        
+        for el in all_elements:
+            # Only family instances can have a host or host face
+            if not isinstance(el, FamilyInstance):
+                continue
+            
+            host_ids = set()
+            
+            # Host-based families (doors, windows, hosted fittings)
+            try:
+                host = el.Host
+                if host is not None:
+                    host_ids.add(host.Id.IntegerValue)
+            except:
+                pass
+            
+            # Face-based families
+            try:
+                host_face = el.HostFace
+                if host_face is not None:
+                    host_ids.add(host_face.ElementId.IntegerValue)
+            except:
+                pass
+            
+            for host_id in host_ids:
+                self._by_host[host_id].append(el.Id)
     
     def GetHostedElements(self, wall):
         """Get all hosted and related elements for a wall - comprehensive method"""
@@ -398,71 +699,53 @@ class AssemblyCreationWindow(Window):
         try:
             wall_solid = self.get_solid(wall)
             
-            # Collect all non-type elements
-            collector = FilteredElementCollector(doc).WhereElementIsNotElementType()
+            # -----------------------------
+            # 1️⃣ 2️⃣ Host-based and face-based families, looked up by host id
+            # -----------------------------
+            for el_id in self._by_host.get(wall.Id.IntegerValue, []):
+                if el_id.IntegerValue not in related_ids:
+                    related.append(el_id)
+                    related_ids.add(el_id.IntegerValue)
             
-            for el in collector:
-                if el.Id == wall.Id:
-                    continue
-                
-                # Skip if already found
-                if el.Id.IntegerValue in related_ids:
+            # Generic models depending on the wall, resolved once per wall
+            try:
+                cutters = set(x.IntegerValue for x in
+                              wall.GetDependentElements(ElementCategoryFilter(BuiltInCategory.OST_GenericModel)) or [])
+            except:
+                cutters = set()
+            
+            # -----------------------------
+            # 3️⃣ Elements cutting the wall
+            # -----------------------------
+            wall_id_int = wall.Id.IntegerValue
+            for el_id_int in cutters:
+                # Skip the wall itself and elements already found
+                if el_id_int == wall_id_int or el_id_int in related_ids:
                     continue
                 
-                # -----------------------------
-                # 1️⃣ Host-based families (doors, windows, hosted fittings)
-                # -----------------------------
-                try:
-                    if hasattr(el, 'Host') and el.Host is not None and el.Host.Id == wall.Id:
-                        related.append(el.Id)
-                        related_ids.add(el.Id.IntegerValue)
-                        continue
-                except:
-                    pass
-                
-                # -----------------------------
-                # 2️⃣ Face-based families
-                # -----------------------------
-                try:
-                    if hasattr(el, 'HostFace') and el.HostFace is not None:
-                        host_ref = el.HostFace
-                        h_el = doc.GetElement(host_ref.ElementId)
-                        if h_el and h_el.Id == wall.Id:
-                            related.append(el.Id)
-                            related_ids.add(el.Id.IntegerValue)
-                            continue
-                except:
-                    pass
-                
-                # -----------------------------
-                # 3️⃣ Elements cutting the wall
-                # -----------------------------
-                try:
-                    cutters = wall.GetDependentElements(ElementCategoryFilter(BuiltInCategory.OST_GenericModel))
-                    if cutters and el.Id in cutters:
-                        related.append(el.Id)
-                        related_ids.add(el.Id.IntegerValue)
-                        continue
-                except:
-                    pass
-                
-                # -----------------------------
-                # 4️⃣ Geometry intersection (if wall has solid)
-                # -----------------------------
-                if wall_solid:
-                    try:
-                        el_solid = self.get_solid(el)
-                        if el_solid:
-                            result = BooleanOperationsUtils.ExecuteBooleanOperation(
-                                wall_solid,
-                                el_solid,
-                                BooleanOperationsType.Intersect
-                            )
-                            if result and result.Volume > 0:
-                                related.append(el.Id)
-                                related_ids.add(el.Id.IntegerValue)
-                    except:
-                        pass
+                el = doc.GetElement(ElementId(el_id_int))
+                if el:
+                    related.append(el.Id)
+                    related_ids.add(el_id_int)
+            
+            # -----------------------------
+            # 4️⃣ Geometry intersection (if wall has solid)
+            # -----------------------------
+            if wall_solid:
+                wall_bbox = wall.get_BoundingBox(None)
+                if wall_bbox:
+                    # Bounding box first, then solid intersection - both run natively in Revit
+                    intersecting_ids = FilteredElementCollector(doc)\
+                        .WhereElementIsNotElementType()\
+                        .Excluding(List[ElementId]([wall.Id]))\
+                        .WherePasses(BoundingBoxIntersectsFilter(Outline(wall_bbox.Min, wall_bbox.Max)))\
+                        .WherePasses(ElementIntersectsSolidFilter(wall_solid))\
+                        .ToElementIds()
+                    
+                    for el_id in intersecting_ids:
+                        if el_id.IntegerValue not in related_ids:
+                            related.append(el_id)
+                            related_ids.add(el_id.IntegerValue)
         
         except Exception as e:
             output.print_md("Warning: Error finding hosted elements - {}".format(str(e)))
@@ -506,6 +789,17 @@ class AssemblyCreationWindow(Window):
         # Step 1: Create all assemblies first
         created_assemblies = []
         
+        # Collect all non-type elements once for every wall
+        all_elements = list(FilteredElementCollector(doc).WhereElementIsNotElementType())
+        self.BuildHostIndex(all_elements)
+        
+        # Resolve hosted elements for every wall while the model is read-only,
+        # so the transaction below only creates assemblies
+        hosted_ids_by_wall = {}
+        for wall_data in selected_walls_data:
+            wall = wall_data.Wall
+            hosted_ids_by_wall[wall.Id.IntegerValue] = self.GetHostedElements(wall)
+        
         with Transaction(doc, "Create Assemblies") as t:
             t.Start()
             
@@ -516,15 +810,15 @@ class AssemblyCreationWindow(Window):
                     
                     try:
                         # Get hosted elements
-                        hosted_ids = self.GetHostedElements(wall)
+                        hosted_ids = hosted_ids_by_wall[wall.Id.IntegerValue]
                         
                         # Create element set with wall and hosted elements
                         element_ids = System.Collections.Generic.List[ElementId]()
                         element_ids.Add(wall.Id)
                         
+                        # GetHostedElements already dedupes and never returns the wall itself
                         for hosted_id in hosted_ids:
-                            if hosted_id not in element_ids:
-                                element_ids.Add(hosted_id)
+                            element_ids.Add(hosted_id)
                         
                         output.print_md("### Assembly: **{}**".format(wall_comment))
                         output.print_md("- Wall ID: {}".format(wall.Id.IntegerValue))
@@ -635,6 +929,7 @@ class AssemblyCreationWindow(Window):
     def SetupEventHandlers(self):
         """Setup all event handlers"""
         self.btnClose.Click += self.OnClose
+        self._window.Closing += self.OnWindowClosing
         self.txtCommentFilter.TextChanged += self.OnCommentFilterChanged
         self.btnSelectAllComments.Click += self.OnSelectAllComments
         self.btnClearComments.Click += self.OnClearComments
@@ -643,37 +938,55 @@ class AssemblyCreationWindow(Window):
         self.btnSelectAll.Click += self.OnSelectAll
         self.btnDeselectAll.Click += self.OnDeselectAll
         self.btnCreateAssemblies.Click += self.OnCreateAssemblies
-        self.dgWalls.CellEditEnding += self.OnCellEditEnding
     
-    def OnCellEditEnding(self, sender, args):
-        """Update selection count when checkbox is edited"""
-        # Use dispatcher to update after edit completes
+    def OnWallSelectionChanged(self, sender, args):
+        """Adjust selection count when a wall is checked or unchecked"""
+        if args.PropertyName != "IsSelected":
+            return
+        self._selected_count += 1 if sender.IsSelected else -1
+        
+        # Use dispatcher to update the text once a burst of changes is done
+        if self._count_pending:
+            return
+        self._count_pending = True
         self._window.Dispatcher.BeginInvoke(
             System.Windows.Threading.DispatcherPriority.Background,
-            System.Action(self.UpdateSelectionCount)
+            System.Action(self.OnSelectionCountDue)
         )
     
+    def OnSelectionCountDue(self):
+        """Run the queued selection count update"""
+        self._count_pending = False
+        self.UpdateSelectionCount()
+    
     def OnClose(self, sender, args):
         """Close window"""
         self._window.Close()
     
+    def OnWindowClosing(self, sender, args):
+        """Stop pending filter refreshes however the window is closed"""
+        self._comment_filter_timer.Stop()
+        self._search_timer.Stop()
+    
     def OnCommentFilterChanged(self, sender, args):
         """Filter comment list"""
-        self.RefreshCommentList()
+        filter_text = self.txtCommentFilter.Text.lower() if self.txtCommentFilter.Text else ""
+        if filter_text == self._last_filter_text:
+            return
+        self._comment_filter_timer.Stop()
+        self._comment_filter_timer.Start()
     
     def OnSelectAllComments(self, sender, args):
         """Select all visible comments"""
-        if self.lstComments.ItemsSource:
-            for item in self.lstComments.ItemsSource:
+        if self.lstComments.Items.Count:
+            for item in self.lstComments.Items:
                 item.IsSelected = True
-            self.lstComments.Items.Refresh()
     
     def OnClearComments(self, sender, args):
         """Clear all comment selections"""
-        if self.lstComments.ItemsSource:
-            for item in self.lstComments.ItemsSource:
+        if self.lstComments.Items.Count:
+            for item in self.lstComments.Items:
                 item.IsSelected = False
-            self.lstComments.Items.Refresh()
     
     def OnLoadWalls(self, sender, args):
         """Load walls for selected comment"""
@@ -681,14 +994,17 @@ class AssemblyCreationWindow(Window):
     
     def OnSearchChanged(self, sender, args):
         """Search text changed"""
-        self.RefreshWallsGrid()
+        search_text = self.txtSearch.Text.lower() if self.txtSearch.Text else ""
+        if search_text == self._last_search_text:
+            return
+        self._search_timer.Stop()
+        self._search_timer.Start()
     
     def OnSelectAll(self, sender, args):
         """Select all visible walls"""
         if self.dgWalls.ItemsSource:
             for wall in self.dgWalls.ItemsSource:
                 wall.IsSelected = True
-            self.dgWalls.Items.Refresh()
             self.UpdateSelectionCount()
     
     def OnDeselectAll(self, sender, args):
@@ -696,7 +1012,6 @@ class AssemblyCreationWindow(Window):
         if self.dgWalls.ItemsSource:
             for wall in self.dgWalls.ItemsSource:
                 wall.IsSelected = False
-            self.dgWalls.Items.Refresh()
             self.UpdateSelectionCount()
     
     def OnCreateAssemblies(self, sender, args):
@@ -22,104 +22,207 @@ from pyrevit import script, forms
 import System
 from System.Windows.Markup import XamlReader
 from System.Windows import Window
+from System.Windows.Controls import DataGridEditingUnit
+from System.Windows.Data import CollectionViewSource
+from System.Windows.Threading import DispatcherTimer, DispatcherPriority
 from System.IO import StreamReader
-from System.Collections.ObjectModel import ObservableCollection
+from System.Collections.Generic import List
 
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
 output = script.get_output()
 
 
+# Marks a lazily computed AssemblyData value that has not been computed yet
+NOT_COMPUTED = object()
+
+# Erection marks are Generic Model or Specialty Equipment families whose
+# family or type name contains one of these words
+ERECTION_MARK_FILTER = ElementMulticategoryFilter(List[BuiltInCategory]([
+    BuiltInCategory.OST_GenericModel,
+    BuiltInCategory.OST_SpecialityEquipment
+]))
+ERECTION_MARK_KEYWORDS = ("erection", "mark")
+
+# Delay after the last keystroke before the search box refreshes the grid
+FILTER_DEBOUNCE_MS = 250
+
+# Logo decode width in pixels when the XAML does not size the logo image
+LOGO_DECODE_WIDTH = 128
+
+
+# ==============================================================================
+# HELPER FUNCTIONS
+# ==============================================================================
+
+def commit_grid_edit(grid):
+    """End a pending checkbox edit so the grid's view can be refreshed or filtered"""
+    if not grid.CommitEdit(DataGridEditingUnit.Row, True):
+        grid.CancelEdit(DataGridEditingUnit.Row)
+
+
+def create_contains_rule(builtin_param, text):
+    """Create a case-insensitive 'contains' rule for a built-in parameter"""
+    param_id = ElementId(builtin_param)
+    try:
+        return ParameterFilterRuleFactory.CreateContainsRule(param_id, text)
+    except TypeError:
+        # Revit 2022 and older also take a case sensitivity flag
+        return ParameterFilterRuleFactory.CreateContainsRule(param_id, text, False)
+
+
+def get_erection_mark_type_ids():
+    """Get ids of the family types whose family or type name marks an erection mark"""
+    name_filters = List[ElementFilter]()
+    for builtin_param in (BuiltInParameter.SYMBOL_NAME_PARAM, BuiltInParameter.SYMBOL_FAMILY_NAME_PARAM):
+        for keyword in ERECTION_MARK_KEYWORDS:
+            name_filters.Add(ElementParameterFilter(create_contains_rule(builtin_param, keyword)))
+    
+    type_ids = FilteredElementCollector(doc)\
+        .WhereElementIsElementType()\
+        .WherePasses(ERECTION_MARK_FILTER)\
+        .WherePasses(LogicalOrFilter(name_filters))\
+        .ToElementIds()
+    return set(i.IntegerValue for i in type_ids)
+
+
+def get_erection_marks_by_assembly():
+    """Map assembly id to the erection mark among its members, in a single collector pass"""
+    marks = {}
+    mark_type_ids = get_erection_mark_type_ids()
+    if not mark_type_ids:
+        return marks
+    
+    # Revit narrows the model down by category, the type id set does the name match
+    candidates = FilteredElementCollector(doc)\
+        .WhereElementIsNotElementType()\
+        .WherePasses(ERECTION_MARK_FILTER)
+    
+    for elem in candidates:
+        assembly_id = elem.AssemblyInstanceId
+        if assembly_id == ElementId.InvalidElementId:
+            continue
+        if elem.GetTypeId().IntegerValue in mark_type_ids:
+            marks.setdefault(assembly_id.IntegerValue, elem)
+    return marks
+
+
+def is_valid_assembly(assembly):
+    """Check that an assembly instance can be listed"""
+    return assembly is not None and assembly.IsValidObject
+
+
+def get_rotation_between(mark_x, assembly_x):
+    """Get the rotation in degrees (-180 to 180) that aligns an assembly X axis with a mark X axis,
+    both given as (x, y) tuples"""
+    # atan2 ignores vector length, so the XY components need no normalizing
+    mark_angle = math.atan2(mark_x[1], mark_x[0])
+    assembly_angle = math.atan2(assembly_x[1], assembly_x[0])
+    
+    # Difference is the rotation needed, wrapped to the -180 to 180 range
+    angle_deg = math.degrees(mark_angle - assembly_angle)
+    return ((angle_deg + 180.0) % 360.0) - 180.0
+
+
 # ==============================================================================
 # DATA CLASS
 # ==============================================================================
 
-class AssemblyData:
+class AssemblyData(System.ComponentModel.INotifyPropertyChanged):
     """Represents an assembly with rotation info"""
+    # Erection marks keyed by assembly id, shared by all assemblies and built on first use
+    _marks_by_assembly = None
+    
+    @classmethod
+    def GetErectionMarksByAssembly(cls):
+        """Get the shared assembly id to erection mark map"""
+        if cls._marks_by_assembly is None:
+            cls._marks_by_assembly = get_erection_marks_by_assembly()
+        return cls._marks_by_assembly
+    
     def __init__(self, assembly):
         self.Assembly = assembly
         self.AssemblyId = str(assembly.Id.IntegerValue)
         self._isSelected = False
+        self._property_changed = None
         
         # Get assembly name
         self.AssemblyName = assembly.AssemblyTypeName if hasattr(assembly, 'AssemblyTypeName') else "Unknown"
         
-        # Get member count
-        self.ElementCount = 0
-        self.ErectionMarkStatus = "Not Found"
-        self.ErectionMarkElement = None
-        self.CurrentAngle = "0°"
+        # Lowercase name and id joined by a separator no search text contains,
+        # computed once so the grid filter is a single substring check
+        self._search_key = self.AssemblyName.lower() + "\x1f" + self.AssemblyId.lower()
         
-        try:
-            # Get member ids
-            member_ids = assembly.GetMemberIds()
-            self.ElementCount = member_ids.Count
-            
-            # Find erection mark
-            for member_id in member_ids:
-                elem = doc.GetElement(member_id)
-                if elem and elem.Category:
-                    # Check if it's a face-based family (Generic Models or Specialty Equipment)
-                    if elem.Category.Id.IntegerValue in [int(BuiltInCategory.OST_GenericModel), 
-                                                          int(BuiltInCategory.OST_SpecialityEquipment)]:
-                        # Check if it has "erection" or "mark" in name/family name
-                        family_name = ""
-                        type_name = ""
-                        
-                        elem_type = doc.GetElement(elem.GetTypeId())
-                        if elem_type:
-                            type_name = elem_type.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM).AsString() if elem_type.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM) else ""
-                            family_param = elem_type.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_NAME_PARAM)
-                            if family_param:
-                                family_name = family_param.AsString()
-                        
-                        # Check if name contains "erection" or "mark"
-                        combined = (family_name + " " + type_name).lower()
-                        if "erection" in combined or "mark" in combined:
-                            self.ErectionMarkElement = elem
-                            self.ErectionMarkStatus = "✓ Found"
-                            break
-            
-            # Calculate current angle if erection mark found
-            if self.ErectionMarkElement:
-                self.CurrentAngle = self.GetErectionMarkAngle()
-                
-        except:
-            pass
+        # Member data is computed on first access, so only rows the grid
+        # actually shows (or the tool rotates) walk their members
+        self._element_count = NOT_COMPUTED
+        self._erection_mark = NOT_COMPUTED
+        self._current_angle = NOT_COMPUTED
+        
+        # Transforms read from Revit once; basis X vectors kept as XY tuples
+        self._transform = NOT_COMPUTED
+        self._assembly_x = NOT_COMPUTED
+        self._mark_x = NOT_COMPUTED
+        
+        # Rotation to apply, set right before rotating
+        self.RotationAngle = 0.0
+    
+    @property
+    def ElementCount(self):
+        if self._element_count is NOT_COMPUTED:
+            try:
+                self._element_count = self.Assembly.GetMemberIds().Count
+            except:
+                self._element_count = 0
+        return self._element_count
+    
+    @property
+    def ErectionMarkElement(self):
+        if self._erection_mark is NOT_COMPUTED:
+            try:
+                self._erection_mark = self.FindErectionMark()
+            except:
+                self._erection_mark = None
+        return self._erection_mark
+    
+    @property
+    def ErectionMarkStatus(self):
+        return "✓ Found" if self.ErectionMarkElement else "Not Found"
+    
+    @property
+    def AssemblyTransform(self):
+        if self._transform is NOT_COMPUTED:
+            self._transform = self.Assembly.GetTransform()
+        return self._transform
+    
+    @property
+    def AssemblyBasisX(self):
+        if self._assembly_x is NOT_COMPUTED:
+            basis_x = self.AssemblyTransform.BasisX
+            self._assembly_x = (basis_x.X, basis_x.Y)
+        return self._assembly_x
+    
+    @property
+    def MarkBasisX(self):
+        if self._mark_x is NOT_COMPUTED:
+            basis_x = self.ErectionMarkElement.GetTransform().BasisX
+            self._mark_x = (basis_x.X, basis_x.Y)
+        return self._mark_x
+    
+    @property
+    def CurrentAngle(self):
+        if self._current_angle is NOT_COMPUTED:
+            self._current_angle = self.GetErectionMarkAngle() if self.ErectionMarkElement else "0°"
+        return self._current_angle
+    
+    def FindErectionMark(self):
+        """Find the erection mark among the assembly members"""
+        return AssemblyData.GetErectionMarksByAssembly().get(self.Assembly.Id.IntegerValue)
     
     def GetErectionMarkAngle(self):
         """Get the rotation angle needed to align assembly with erection mark"""
         try:
-            mark = self.ErectionMarkElement
-            assembly = self.Assembly
-            
-            # Get erection mark's transform
-            mark_trans = mark.GetTransform()
-            mark_x = mark_trans.BasisX
-            
-            # Get assembly's current transform
-            assembly_trans = assembly.GetTransform()
-            assembly_x = assembly_trans.BasisX
-            
-            # Project to XY plane
-            mark_x_2d = XYZ(mark_x.X, mark_x.Y, 0).Normalize()
-            assembly_x_2d = XYZ(assembly_x.X, assembly_x.Y, 0).Normalize()
-            
-            # Calculate angles
-            mark_angle = math.atan2(mark_x_2d.Y, mark_x_2d.X)
-            assembly_angle = math.atan2(assembly_x_2d.Y, assembly_x_2d.X)
-            
-            # Difference is the rotation needed
-            angle_rad = mark_angle - assembly_angle
-            angle_deg = math.degrees(angle_rad)
-            
-            # Normalize to -180 to 180
-            while angle_deg > 180:
-                angle_deg -= 360
-            while angle_deg < -180:
-                angle_deg += 360
-            
-            return "{:.1f}°".format(angle_deg)
+            return "{:.1f}°".format(get_rotation_between(self.MarkBasisX, self.AssemblyBasisX))
         except:
             return "Unknown"
     
@@ -129,7 +232,20 @@ class AssemblyData:
     
     @IsSelected.setter
     def IsSelected(self, value):
-        self._isSelected = value
+        if self._isSelected != value:
+            self._isSelected = value
+            self.OnPropertyChanged("IsSelected")
+    
+    def add_PropertyChanged(self, handler):
+        self._property_changed = System.Delegate.Combine(self._property_changed, handler)
+    
+    def remove_PropertyChanged(self, handler):
+        self._property_changed = System.Delegate.Remove(self._property_changed, handler)
+    
+    def OnPropertyChanged(self, property_name):
+        if self._property_changed:
+            args = System.ComponentModel.PropertyChangedEventArgs(property_name)
+            self._property_changed(self, args)
 
 
 # ==============================================================================
@@ -171,11 +287,34 @@ class RotateAssembliesWindow(Window):
         self.txtStatus = self._window.FindName("txtStatus")
         self.btnRotate = self._window.FindName("btnRotate")
         
+        # Assembly rows, replaced on each load; searching goes through the default view's Filter
+        self._assemblies_view = List[object]()
+        self.dgAssemblies.ItemsSource = self._assemblies_view
+        
+        # Selected assemblies among the visible rows, kept up to date from IsSelected changes
+        self._selected_count = 0
+        self._suspend_count = False
+        
+        # Debounce timer so a burst of keystrokes triggers a single refresh
+        self._search_timer = self.CreateDebounceTimer(self.RefreshGrid)
+        
         # Setup
         self.LoadLogo()
-        self.LoadAssemblies()
+        self.ScheduleLoadAssemblies()
         self.SetupEventHandlers()
     
+    def CreateDebounceTimer(self, callback):
+        """Create a timer that runs callback once typing pauses"""
+        timer = DispatcherTimer()
+        timer.Interval = System.TimeSpan.FromMilliseconds(FILTER_DEBOUNCE_MS)
+        
+        def on_tick(sender, args):
+            timer.Stop()
+            callback()
+        
+        timer.Tick += on_tick
+        return timer
+    
     def LoadLogo(self):
         """Load BA logo"""
         try:
@@ -186,8 +325,14 @@ class RotateAssembliesWindow(Window):
                 logo_path = os.path.join(self.script_dir, "icon.png")
             
             if os.path.exists(logo_path):
+                # Decode straight to the displayed size instead of the full resolution
+                decode_width = self.imgLogo.Width
+                if not decode_width or System.Double.IsNaN(decode_width):
+                    decode_width = LOGO_DECODE_WIDTH
+                
                 bitmap = Imaging.BitmapImage()
                 bitmap.BeginInit()
+                bitmap.DecodePixelWidth = int(decode_width)
                 bitmap.UriSource = System.Uri(logo_path)
                 bitmap.CacheOption = Imaging.BitmapCacheOption.OnLoad
                 bitmap.EndInit()
@@ -195,52 +340,77 @@ class RotateAssembliesWindow(Window):
         except:
             pass
     
+    def ScheduleLoadAssemblies(self):
+        """Show the loading status now and load assemblies once the window has rendered"""
+        self.txtStatus.Text = "Loading assemblies..."
+        self._window.Dispatcher.BeginInvoke(
+            DispatcherPriority.Background,
+            System.Action(self.LoadAssemblies)
+        )
+    
     def LoadAssemblies(self):
         """Load all assemblies in the project"""
-        self.txtStatus.Text = "Loading assemblies..."
+        self.ApplyAssemblies(self.CollectAssemblies())
+    
+    def CollectAssemblies(self):
+        """Build AssemblyData for every assembly in the project, without touching the UI"""
+        # Erection marks may have changed since the last load
+        AssemblyData._marks_by_assembly = None
         
         # Get all assembly instances
-        collector = FilteredElementCollector(doc)\
+        assemblies = FilteredElementCollector(doc)\
             .OfClass(AssemblyInstance)\
-            .WhereElementIsNotElementType()
+            .WhereElementIsNotElementType()\
+            .ToElements()
         
         assembly_list = []
-        for assembly in collector:
-            try:
+        try:
+            for assembly in assemblies:
+                if not is_valid_assembly(assembly):
+                    continue
                 assembly_data = AssemblyData(assembly)
+                assembly_data.PropertyChanged += self.OnAssemblySelectionChanged
                 assembly_list.append(assembly_data)
-            except:
-                continue
+        except Exception as e:
+            output.print_md("Warning: Error loading assemblies - {}".format(str(e)))
         
+        return assembly_list
+    
+    def ApplyAssemblies(self, assembly_list):
+        """Show loaded assemblies in the grid"""
         self.all_assemblies = assembly_list
+        
+        # The rows only change on load, so bind a plain list snapshot; it raises
+        # no per-item change events the way an ObservableCollection would
+        self._assemblies_view = List[object](assembly_list)
+        commit_grid_edit(self.dgAssemblies)
+        self.dgAssemblies.ItemsSource = self._assemblies_view
+        
         self.RefreshGrid()
         
         self.txtAssemblyCount.Text = "Found {} assemblies in project".format(len(assembly_list))
-        self.UpdateSelectedCount()
         self.txtStatus.Text = "Ready - Select assemblies to rotate"
     
     def RefreshGrid(self):
         """Refresh the assemblies DataGrid"""
         search_text = self.txtSearch.Text.lower() if self.txtSearch.Text else ""
         
+        # Hide non-matching rows in place instead of rebuilding the grid;
+        # the debounce can fire while a checkbox edit is open, which the filter rejects
+        commit_grid_edit(self.dgAssemblies)
+        view = CollectionViewSource.GetDefaultView(self._assemblies_view)
         if search_text:
-            filtered = [a for a in self.all_assemblies 
-                       if search_text in a.AssemblyName.lower() 
-                       or search_text in a.AssemblyId.lower()]
+            view.Filter = System.Predicate[object](lambda a: search_text in a._search_key)
         else:
-            filtered = self.all_assemblies
-        
-        collection = ObservableCollection[object]()
-        for assembly in filtered:
-            collection.Add(assembly)
+            view.Filter = None
         
-        self.dgAssemblies.ItemsSource = collection
+        # The visible rows changed, so recount once; edits adjust the count from here on
+        self._selected_count = sum(1 for a in self.dgAssemblies.Items if a.IsSelected)
+        self.UpdateSelectedCount()
     
     def UpdateSelectedCount(self):
         """Update selected count text"""
-        if self.dgAssemblies.ItemsSource:
-            selected = sum(1 for a in self.dgAssemblies.ItemsSource if a.IsSelected)
-            self.txtSelectedCount.Text = "{} selected".format(selected)
+        self.txtSelectedCount.Text = "{} selected".format(self._selected_count)
     
     def GetRotationAxis(self):
         """Get selected rotation axis"""
@@ -259,43 +429,9 @@ class RotateAssembliesWindow(Window):
             # Auto mode - align assembly with erection mark orientation
             if assembly_data.ErectionMarkElement:
                 try:
-                    mark = assembly_data.ErectionMarkElement
-                    assembly = assembly_data.Assembly
-                    
-                    # Get erection mark's transform (target orientation)
-                    mark_trans = mark.GetTransform()
-                    mark_x = mark_trans.BasisX
-                    mark_y = mark_trans.BasisY
-                    
-                    # Get assembly's current transform
-                    assembly_trans = assembly.GetTransform()
-                    assembly_x = assembly_trans.BasisX
-                    assembly_y = assembly_trans.BasisY
-                    
                     # Calculate angle between assembly X and mark X (in XY plane)
                     # This gives us the rotation needed to align them
-                    
-                    # Project vectors to XY plane (ignore Z component)
-                    mark_x_2d = XYZ(mark_x.X, mark_x.Y, 0).Normalize()
-                    assembly_x_2d = XYZ(assembly_x.X, assembly_x.Y, 0).Normalize()
-                    
-                    # Calculate angle using atan2 for proper quadrant
-                    mark_angle = math.atan2(mark_x_2d.Y, mark_x_2d.X)
-                    assembly_angle = math.atan2(assembly_x_2d.Y, assembly_x_2d.X)
-                    
-                    # Difference is the rotation needed
-                    angle_rad = mark_angle - assembly_angle
-                    
-                    # Convert to degrees
-                    angle_deg = math.degrees(angle_rad)
-                    
-                    # Normalize to -180 to 180 range
-                    while angle_deg > 180:
-                        angle_deg -= 360
-                    while angle_deg < -180:
-                        angle_deg += 360
-                    
-                    return angle_deg
+                    return get_rotation_between(assembly_data.MarkBasisX, assembly_data.AssemblyBasisX)
                     
                 except Exception as e:
                     output.print_md("Error calculating angle: {}".format(str(e)))
@@ -309,10 +445,21 @@ class RotateAssembliesWindow(Window):
             except:
                 return 0.0
     
+    def PrecomputeRotationAngles(self, selected):
+        """Calculate every selected assembly's rotation angle in one pass before rotating"""
+        if self.rbManual.IsChecked and selected:
+            # Manual mode uses the same angle for every assembly, parse it once
+            angle_deg = self.CalculateRotationAngle(selected[0])
+            for assembly_data in selected:
+                assembly_data.RotationAngle = angle_deg
+        else:
+            for assembly_data in selected:
+                assembly_data.RotationAngle = self.CalculateRotationAngle(assembly_data)
+    
     def RotateAssemblies(self):
         """Rotate selected assemblies"""
         # Get selected assemblies
-        selected = [a for a in self.dgAssemblies.ItemsSource if a.IsSelected]
+        selected = [a for a in self.dgAssemblies.Items if a.IsSelected]
         
         if not selected:
             TaskDialog.Show("Error", "Please select assemblies to rotate")
@@ -354,70 +501,89 @@ class RotateAssembliesWindow(Window):
         self._window.Close()
         
         # Rotate assemblies
-        output.print_md("# Assembly Rotation")
-        output.print_md("**Selected**: {} assemblies".format(len(selected)))
-        output.print_md("**Mode**: {}".format(mode))
-        output.print_md("**Axis**: {}".format(axis_name))
-        output.print_md("---")
+        output.print_md("\n\n".join([
+            "# Assembly Rotation",
+            "**Selected**: {} assemblies".format(len(selected)),
+            "**Mode**: {}".format(mode),
+            "**Axis**: {}".format(axis_name),
+            "---"
+        ]))
         
         rotated = 0
         skipped = 0
         failed = 0
         
-        # Process each assembly in its own transaction
-        for i, assembly_data in enumerate(selected):
-            t = Transaction(doc, "Rotate Assembly {}".format(i + 1))
-            t.Start()
+        # Per-assembly results, printed in one block after the loop
+        report_lines = []
+        
+        # Angles are read from the model up front, so the transaction only writes
+        self.PrecomputeRotationAngles(selected)
+        
+        # The axis is the same for every assembly, normalize it once
+        axis_normalized = axis.Normalize()
+        
+        # Process all assemblies in one transaction, each in its own sub-transaction
+        # so a failed or skipped assembly only rolls back itself
+        t = Transaction(doc, "Rotate Assemblies")
+        t.Start()
+        
+        for assembly_data in selected:
+            # Precomputed rotation angle; nothing to do (and no sub-transaction) for zero
+            angle_deg = assembly_data.RotationAngle
+            
+            if angle_deg == 0:
+                report_lines.append("- ⚠ **Skipped**: {} (angle = 0°)".format(assembly_data.AssemblyName))
+                skipped += 1
+                continue
+            
+            st = SubTransaction(doc)
+            st.Start()
             
             try:
                 assembly = assembly_data.Assembly
                 
-                # Calculate rotation angle
-                angle_deg = self.CalculateRotationAngle(assembly_data)
-                
-                if angle_deg == 0:
-                    output.print_md("- ⚠ **Skipped**: {} (angle = 0°)".format(assembly_data.AssemblyName))
-                    skipped += 1
-                    t.RollBack()
-                    continue
-                
                 # Get assembly transform and origin
-                trans = assembly.GetTransform()
-                origin = trans.Origin
-                
-                # Normalize axis
-                axis_normalized = axis.Normalize()
+                trans = assembly_data.AssemblyTransform
                 
                 # Create rotation transform
-                angle_rad = math.radians(angle_deg)
                 rotation_transform = Transform.CreateRotationAtPoint(
                     axis_normalized,
-                    angle_rad,
-                    origin
+                    math.radians(angle_deg),
+                    trans.Origin
                 )
                 
                 # Apply rotation
                 new_transform = rotation_transform.Multiply(trans)
                 assembly.SetTransform(new_transform)
                 
-                t.Commit()
+                st.Commit()
                 
-                output.print_md("- ✅ **Rotated**: {} by {:.1f}°".format(
+                report_lines.append("- ✅ **Rotated**: {} by {:.1f}°".format(
                     assembly_data.AssemblyName, angle_deg))
                 rotated += 1
                 
             except Exception as e:
-                t.RollBack()
-                output.print_md("- ❌ **Failed**: {} - {}".format(
+                st.RollBack()
+                report_lines.append("- ❌ **Failed**: {} - {}".format(
                     assembly_data.AssemblyName, str(e)))
                 failed += 1
         
+        if rotated > 0:
+            t.Commit()
+        else:
+            t.RollBack()
+        
+        if report_lines:
+            output.print_md("\n".join(report_lines))
+        
         # Report
-        output.print_md("---")
-        output.print_md("### 📊 Summary")
-        output.print_md("**Rotated**: {}".format(rotated))
-        output.print_md("**Skipped**: {}".format(skipped))
-        output.print_md("**Failed**: {}".format(failed))
+        output.print_md("\n\n".join([
+            "---",
+            "### 📊 Summary",
+            "**Rotated**: {}".format(rotated),
+            "**Skipped**: {}".format(skipped),
+            "**Failed**: {}".format(failed)
+        ]))
         
         if rotated > 0:
             TaskDialog.Show("Complete", 
@@ -435,52 +601,75 @@ class RotateAssembliesWindow(Window):
     def SetupEventHandlers(self):
         """Setup all event handlers"""
         self.btnClose.Click += self.OnClose
+        self._window.Closing += self.OnWindowClosing
         self.btnRefresh.Click += self.OnRefresh
         self.txtSearch.TextChanged += self.OnSearchChanged
         self.btnSelectAll.Click += self.OnSelectAll
         self.btnDeselectAll.Click += self.OnDeselectAll
         self.btnRotate.Click += self.OnRotate
-        self.dgAssemblies.CellEditEnding += self.OnCellEditEnding
     
     def OnClose(self, sender, args):
         """Close window"""
         self._window.Close()
     
+    def OnWindowClosing(self, sender, args):
+        """Stop a pending search refresh however the window is closed"""
+        self._search_timer.Stop()
+    
     def OnRefresh(self, sender, args):
         """Refresh assemblies list"""
-        self.LoadAssemblies()
+        self.ScheduleLoadAssemblies()
     
     def OnSearchChanged(self, sender, args):
         """Search text changed"""
-        self.RefreshGrid()
+        self._search_timer.Stop()
+        self._search_timer.Start()
     
     def OnSelectAll(self, sender, args):
         """Select all visible assemblies"""
-        if self.dgAssemblies.ItemsSource:
-            for item in self.dgAssemblies.ItemsSource:
-                item.IsSelected = True
-            self.dgAssemblies.Items.Refresh()
+        if self.dgAssemblies.Items.Count:
+            # Snapshot the visible rows, the view cannot be read while its refresh is deferred
+            items = list(self.dgAssemblies.Items)
+            commit_grid_edit(self.dgAssemblies)
+            self._suspend_count = True
+            defer = self.dgAssemblies.Items.DeferRefresh()
+            try:
+                for item in items:
+                    item.IsSelected = True
+            finally:
+                defer.Dispose()
+                self._suspend_count = False
+            self._selected_count = len(items)
             self.UpdateSelectedCount()
     
     def OnDeselectAll(self, sender, args):
         """Deselect all assemblies"""
-        if self.dgAssemblies.ItemsSource:
-            for item in self.dgAssemblies.ItemsSource:
-                item.IsSelected = False
-            self.dgAssemblies.Items.Refresh()
+        if self.dgAssemblies.Items.Count:
+            # Snapshot the visible rows, the view cannot be read while its refresh is deferred
+            items = list(self.dgAssemblies.Items)
+            commit_grid_edit(self.dgAssemblies)
+            self._suspend_count = True
+            defer = self.dgAssemblies.Items.DeferRefresh()
+            try:
+                for item in items:
+                    item.IsSelected = False
+            finally:
+                defer.Dispose()
+                self._suspend_count = False
+            self._selected_count = 0
             self.UpdateSelectedCount()
     
+    def OnAssemblySelectionChanged(self, sender, args):
+        """Adjust selection count when an assembly is checked or unchecked"""
+        if self._suspend_count or args.PropertyName != "IsSelected":
+            return
+        self._selected_count += 1 if sender.IsSelected else -1
+        self.UpdateSelectedCount()
+    
     def OnRotate(self, sender, args):
         """Rotate button clicked"""
         self.RotateAssemblies()
     
-    def OnCellEditEnding(self, sender, args):
-        """Update when checkbox changes"""
-        self._window.Dispatcher.BeginInvoke(
-            System.Windows.Threading.DispatcherPriority.Background,
-            System.Action(self.UpdateSelectedCount)
-        )
-    
     def ShowDialog(self):
         """Show the window"""
         return self._window.ShowDialog()
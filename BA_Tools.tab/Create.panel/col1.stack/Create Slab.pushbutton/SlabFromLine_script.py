@@ -7,7 +7,9 @@ __title__ = 'Slab from\nLine'
 __doc__ = 'Create slabs from lines'
 
 import clr
+import math
 import os
+import traceback
 
 clr.AddReference("RevitAPI")
 clr.AddReference("RevitAPIUI")
@@ -19,31 +21,230 @@ clr.AddReference("System.Xaml")
 from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import *
 from Autodesk.Revit.UI.Selection import ObjectType, ISelectionFilter
+from Autodesk.Revit.Exceptions import ArgumentException as RevitArgumentException, InvalidOperationException as RevitInvalidOperationException
 from pyrevit import script, forms
 import System
 from System.Windows.Markup import XamlReader
-from System.Windows import Window
-from System.IO import StreamReader
+from System.Windows import Window, NameScope
+from System.IO import File
 from System.Collections.Generic import List
+from System.Globalization import NumberStyles, CultureInfo
 
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
 output = script.get_output()
 
+# Closed generic list types used for slab profiles, resolved once instead of per segment
+CurveList = List[Curve]
+CurveLoopList = List[CurveLoop]
+
+# Named XAML controls the window binds to attributes of the same name
+CONTROL_NAMES = (
+    "imgLogo", "btnClose",
+    "cmbLineType", "cmbSlabType", "cmbLevel",
+    "txtOffsetFeet", "txtOffsetInches",
+    "txtLeftWidthFeet", "txtLeftWidthInches",
+    "txtRightWidthFeet", "txtRightWidthInches",
+    "chkSplitSlab", "txtIntervalFeet", "txtIntervalInches", "txtJointGap",
+    "txtStatus", "btnCreateSlabs",
+)
+
+# AppDomain data slot prefix for the line category lookup of each document;
+# scripts get a fresh module per run, the AppDomain lives as long as Revit
+LOOKUP_CACHE_KEY = "BA_Tools.SlabFromLine."
+
+# AppDomain data slot prefix for XAML markup read from disk
+XAML_CACHE_KEY = "BA_Tools.Xaml."
+
+# AppDomain data slot prefix for decoded logos
+LOGO_CACHE_KEY = "BA_Tools.Logo."
+
+# Split segment floors created per SubTransaction
+FLOOR_BATCH_SIZE = 50
+
+# Line categories offered in the line type dropdown
+LINE_CATEGORIES = (
+    (BuiltInCategory.OST_Lines, "Model Lines"),
+    (BuiltInCategory.OST_SketchLines, "Sketch Lines"),
+    (BuiltInCategory.OST_RoomSeparationLines, "Room Separation Lines"),
+)
+
+
+# ==============================================================================
+# LOOKUP CACHE
+# ==============================================================================
+
+def get_cached_lookup(kind, token, build):
+    """
+    Get the (name, ElementId) pairs of one dropdown for the active document.
+    The pairs are kept between window opens and rebuilt when token changes
+    """
+    domain = System.AppDomain.CurrentDomain
+    slot = "{}{}.{}.{}".format(LOOKUP_CACHE_KEY, kind, doc.GetHashCode(), doc.PathName)
+    cached = domain.GetData(slot)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+    
+    pairs = tuple(build())
+    domain.SetData(slot, (token, pairs))
+    return pairs
+
+
+def get_xaml_text(xaml_path):
+    """Get the XAML markup of a window, reading the file again only after it changes"""
+    domain = System.AppDomain.CurrentDomain
+    slot = XAML_CACHE_KEY + xaml_path
+    modified = os.path.getmtime(xaml_path)
+    cached = domain.GetData(slot)
+    if cached is not None and cached[0] == modified:
+        return cached[1]
+    
+    text = File.ReadAllText(xaml_path)
+    domain.SetData(slot, (modified, text))
+    return text
+
+
+def load_logo(script_dir):
+    """Get the frozen BA logo bitmap, decoding it only once per Revit session"""
+    import System.Windows.Media.Imaging as Imaging
+    
+    logo_path = os.path.join(script_dir, "BA_logo.png")
+    if not os.path.exists(logo_path):
+        logo_path = os.path.join(script_dir, "icon.png")
+    
+    domain = System.AppDomain.CurrentDomain
+    bitmap = domain.GetData(LOGO_CACHE_KEY + logo_path)
+    if bitmap is None and os.path.exists(logo_path):
+        bitmap = Imaging.BitmapImage()
+        bitmap.BeginInit()
+        bitmap.UriSource = System.Uri(logo_path)
+        bitmap.CacheOption = Imaging.BitmapCacheOption.OnLoad
+        bitmap.EndInit()
+        bitmap.Freeze()
+        domain.SetData(LOGO_CACHE_KEY + logo_path, bitmap)
+    return bitmap
+
+
+def collect_line_types():
+    """Get (name, category id) pairs of the supported line categories"""
+    categories = doc.Settings.Categories
+    for cat_id, cat_name in LINE_CATEGORIES:
+        try:
+            category = categories.get_Item(cat_id)
+            if category:
+                yield cat_name, category.Id
+        except:
+            pass
+
+
+def collect_slab_types():
+    """Get (name, type id) pairs of all floor types sorted by name"""
+    floor_types = FilteredElementCollector(doc).OfClass(FloorType).ToElements()
+    # Read each name once, then sort the pairs on it
+    pairs = [(ft.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_AND_TYPE_NAMES_PARAM).AsString(), ft.Id)
+             for ft in floor_types]
+    pairs.sort(key=lambda pair: pair[0])
+    return pairs
+
+
+def collect_levels():
+    """Get (name, level id) pairs of all levels sorted by elevation"""
+    levels = FilteredElementCollector(doc).OfClass(Level).ToElements()
+    return [(level.Name, level.Id) for level in sorted(levels, key=lambda x: x.Elevation)]
+
+
+# ==============================================================================
+# INPUT PARSING
+# ==============================================================================
+
+def parse_number_fields(fields):
+    """
+    Parse (textbox, name, minimum, exclusive maximum, range message) fields in order.
+    Returns (values, None), or (None, message) for the first invalid field
+    """
+    values = []
+    for textbox, name, minimum, maximum, range_message in fields:
+        ok, value = System.Double.TryParse(textbox.Text, NumberStyles.Float, CultureInfo.InvariantCulture)
+        if not ok:
+            return None, "Invalid {} value".format(name)
+        if (minimum is not None and value < minimum) or (maximum is not None and value >= maximum):
+            return None, range_message
+        values.append(value)
+    return values, None
+
 
 # ==============================================================================
 # SLAB CREATION FUNCTION
 # ==============================================================================
 
-def CreateSlabFromLine(line_element, slab_type_id, level_id, offset_ft, left_width_ft, right_width_ft, doc):
+def get_line_frame(line_curve):
     """
-    Create slab from line with left and right offsets
+    Get origin, unit direction, unit perpendicular and length of a straight line as plain floats.
+    The perpendicular is taken in plan, normalized from its two components without an XYZ round trip
+    """
+    start_pt = line_curve.GetEndPoint(0)
+    end_pt = line_curve.GetEndPoint(1)
+    sx, sy, sz = start_pt.X, start_pt.Y, start_pt.Z
+    vx, vy, vz = end_pt.X - sx, end_pt.Y - sy, end_pt.Z - sz
+    length = math.sqrt(vx * vx + vy * vy + vz * vz)
+    plan_length = math.hypot(vx, vy)
+    return ((sx, sy, sz),
+            (vx / length, vy / length, vz / length),
+            (-vy / plan_length, vx / plan_length),
+            length)
+
+
+def get_offset_corners(origin, direction, perp, start_dist, end_dist, left_width_ft, right_width_ft):
+    """
+    Get left start, left end, right end and right start corners of a straight slab segment.
+    origin and direction are (x, y, z) tuples, perp is an (x, y) tuple; XYZ objects are
+    only created for the returned corners
+    """
+    ox, oy, oz = origin
+    dx, dy, dz = direction
+    px, py = perp
+    
+    # Segment points on centerline
+    ax, ay, az = ox + dx * start_dist, oy + dy * start_dist, oz + dz * start_dist
+    bx, by, bz = ox + dx * end_dist, oy + dy * end_dist, oz + dz * end_dist
+    
+    return (XYZ(ax + px * left_width_ft, ay + py * left_width_ft, az),
+            XYZ(bx + px * left_width_ft, by + py * left_width_ft, bz),
+            XYZ(bx - px * right_width_ft, by - py * right_width_ft, bz),
+            XYZ(ax - px * right_width_ft, ay - py * right_width_ft, az))
+
+
+def make_curve_loop(buffer, curves):
+    """
+    Refill buffer with curves and build a CurveLoop from it.
+    CurveLoop.Create copies the curves, so the same buffer can be reused for every loop
+    """
+    buffer.Clear()
+    buffer.AddRange(curves)
+    return CurveLoop.Create(buffer)
+
+
+def get_cached_profile(profile_cache, shape_key, anchor):
+    """
+    Get a cached slab profile of the same shape moved to anchor, or None when the shape is new.
+    anchor is the (x, y, z) point the profile is built around
+    """
+    if profile_cache is None or shape_key not in profile_cache:
+        return None
+    cached_loop, (ax, ay, az) = profile_cache[shape_key]
+    x, y, z = anchor
+    return CurveLoop.CreateViaTransform(cached_loop, Transform.CreateTranslation(XYZ(x - ax, y - ay, z - az)))
+
+
+def CreateSlabFromLine(location_curve, slab_type_id, level_id, offset_ft, left_width_ft, right_width_ft, doc,
+                       profile_cache=None):
+    """
+    Create slab from a line's curve with left and right offsets.
+    The curve is the one resolved at selection, so it is not read back from the line element.
+    profile_cache maps shape keys to built profiles so lines of the same shape reuse them
     """
     try:
-        # Get the line geometry
-        location_curve = line_element.GeometryCurve
-        
         if not location_curve:
             return [], "No curve found"
         
@@ -56,27 +257,26 @@ def CreateSlabFromLine(line_element, slab_type_id, level_id, offset_ft, left_wid
         # We need to create a closed curve loop offset from the line
         
         if isinstance(location_curve, Line):
-            start_pt = location_curve.GetEndPoint(0)
-            end_pt = location_curve.GetEndPoint(1)
-            direction = (end_pt - start_pt).Normalize()
-            
-            # Calculate perpendicular direction
-            perp = XYZ(-direction.Y, direction.X, 0).Normalize()
-            
-            # Create 4 corners of the slab
-            p1 = start_pt + (perp * left_width_ft)   # Left start
-            p2 = end_pt + (perp * left_width_ft)     # Left end
-            p3 = end_pt - (perp * right_width_ft)    # Right end
-            p4 = start_pt - (perp * right_width_ft)  # Right start
+            origin, direction, perp, length = get_line_frame(location_curve)
             
-            # Create closed curve loop
-            curves = List[Curve]()
-            curves.Add(Line.CreateBound(p1, p2))
-            curves.Add(Line.CreateBound(p2, p3))
-            curves.Add(Line.CreateBound(p3, p4))
-            curves.Add(Line.CreateBound(p4, p1))
+            # Same length and direction give the same profile, only moved to this line's start
+            shape_key = ("Line", round(length, 6)) + tuple(round(d, 6) for d in direction)
+            curve_loop = get_cached_profile(profile_cache, shape_key, origin)
             
-            curve_loop = CurveLoop.Create(curves)
+            if not curve_loop:
+                # Create 4 corners of the slab: left start, left end, right end, right start
+                p1, p2, p3, p4 = get_offset_corners(origin, direction, perp, 0.0, length,
+                                                    left_width_ft, right_width_ft)
+                
+                # Create closed curve loop
+                curve_loop = make_curve_loop(CurveList(), [
+                    Line.CreateBound(p1, p2),
+                    Line.CreateBound(p2, p3),
+                    Line.CreateBound(p3, p4),
+                    Line.CreateBound(p4, p1),
+                ])
+                if profile_cache is not None:
+                    profile_cache[shape_key] = (curve_loop, origin)
             
         elif isinstance(location_curve, Arc):
             # For arcs, we need to create offset arcs on both sides
@@ -98,33 +298,44 @@ def CreateSlabFromLine(line_element, slab_type_id, level_id, offset_ft, left_wid
             # Get start and end angles
             start_param = arc.GetEndParameter(0)
             end_param = arc.GetEndParameter(1)
+            x_dir = arc.XDirection
+            y_dir = arc.YDirection
             
-            # Create outer arc (left offset)
-            outer_arc = Arc.Create(center, outer_radius, start_param, end_param, arc.XDirection, arc.YDirection)
-            
-            # Create inner arc (right offset)
-            inner_arc = Arc.Create(center, inner_radius, start_param, end_param, arc.XDirection, arc.YDirection)
-            
-            # Get connection lines at ends
-            start_outer = outer_arc.Evaluate(0.0, True)
-            start_inner = inner_arc.Evaluate(0.0, True)
-            end_outer = outer_arc.Evaluate(1.0, True)
-            end_inner = inner_arc.Evaluate(1.0, True)
+            # Same radius, sweep and orientation give the same profile, only moved to this arc's center
+            anchor = (center.X, center.Y, center.Z)
+            shape_key = ("Arc", round(radius, 6), round(start_param, 6), round(end_param, 6),
+                         round(x_dir.X, 6), round(x_dir.Y, 6), round(x_dir.Z, 6),
+                         round(y_dir.X, 6), round(y_dir.Y, 6), round(y_dir.Z, 6))
+            curve_loop = get_cached_profile(profile_cache, shape_key, anchor)
             
-            # Create closed curve loop
-            curves = List[Curve]()
-            curves.Add(outer_arc)
-            curves.Add(Line.CreateBound(end_outer, end_inner))
-            curves.Add(inner_arc.CreateReversed())
-            curves.Add(Line.CreateBound(start_inner, start_outer))
-            
-            curve_loop = CurveLoop.Create(curves)
+            if not curve_loop:
+                # Create outer arc (left offset)
+                outer_arc = Arc.Create(center, outer_radius, start_param, end_param, x_dir, y_dir)
+                
+                # Create inner arc (right offset)
+                inner_arc = Arc.Create(center, inner_radius, start_param, end_param, x_dir, y_dir)
+                
+                # Get connection lines at ends
+                start_outer = outer_arc.Evaluate(0.0, True)
+                start_inner = inner_arc.Evaluate(0.0, True)
+                end_outer = outer_arc.Evaluate(1.0, True)
+                end_inner = inner_arc.Evaluate(1.0, True)
+                
+                # Create closed curve loop
+                curve_loop = make_curve_loop(CurveList(), [
+                    outer_arc,
+                    Line.CreateBound(end_outer, end_inner),
+                    inner_arc.CreateReversed(),
+                    Line.CreateBound(start_inner, start_outer),
+                ])
+                if profile_cache is not None:
+                    profile_cache[shape_key] = (curve_loop, anchor)
         
         else:
             return [], "Unsupported curve type"
         
         # Create profile
-        curve_loops = List[CurveLoop]()
+        curve_loops = CurveLoopList()
         curve_loops.Add(curve_loop)
         
         # Create slab
@@ -144,6 +355,185 @@ def CreateSlabFromLine(line_element, slab_type_id, level_id, offset_ft, left_wid
         return [], str(e)
 
 
+def get_segment_ranges(splits, segment_start, line_length, joint_gap_ft):
+    """
+    Get (index, start distance, end distance) of every sub-segment of one line in a single pass.
+    splits are positions along the whole selection; index is None for the last segment
+    """
+    ranges = []
+    half_gap = joint_gap_ft / 2.0
+    prev_distance = 0.0
+    
+    for idx, split_pos in enumerate(splits):
+        # Distance on THIS line where split should occur
+        distance_on_line = split_pos - segment_start
+        
+        # Segment from prev_distance to (distance_on_line - gap/2)
+        seg_end_dist = distance_on_line - half_gap
+        if seg_end_dist - prev_distance > 0.01:
+            ranges.append((idx, prev_distance, seg_end_dist))
+        
+        # Next segment starts AFTER the gap
+        prev_distance = distance_on_line + half_gap
+    
+    # Last segment from last split to end
+    if line_length - prev_distance > 0.01:
+        ranges.append((None, prev_distance, line_length))
+    
+    return ranges
+
+
+def get_segment_builder(line_curve, line_length, left_width_ft, right_width_ft):
+    """
+    Get a function building the slab CurveLoop between two distances along a line or arc.
+    The builder returns None when the segment has no valid profile
+    """
+    # One curve buffer per line, CurveLoop.Create copies the curves it is given
+    curves = CurveList()
+    
+    if isinstance(line_curve, Line):
+        # Line frame as plain floats, segment corners are computed from these
+        line_origin, line_dir, line_perp, _ = get_line_frame(line_curve)
+        
+        def build_line_segment(seg_start_dist, seg_end_dist):
+            # Left and right boundary corners
+            left_start, left_end, right_end, right_start = get_offset_corners(
+                line_origin, line_dir, line_perp,
+                seg_start_dist, seg_end_dist, left_width_ft, right_width_ft)
+            
+            # Create closed loop in the line's buffer
+            return make_curve_loop(curves, [
+                Line.CreateBound(left_start, left_end),
+                Line.CreateBound(left_end, right_end),
+                Line.CreateBound(right_end, right_start),
+                Line.CreateBound(right_start, left_start),
+            ])
+        
+        return build_line_segment
+    
+    if isinstance(line_curve, Arc):
+        # Arc frame depends only on the line, read it once for all segments
+        arc = line_curve
+        center = arc.Center
+        radius = arc.Radius
+        x_dir = arc.XDirection
+        y_dir = arc.YDirection
+        full_start = arc.GetEndParameter(0)
+        param_range = arc.GetEndParameter(1) - full_start
+        outer_radius = radius + left_width_ft
+        inner_radius = radius - right_width_ft
+        
+        # Right offset too large for arc radius, no segment has a valid profile
+        if inner_radius <= 0:
+            return lambda seg_start_dist, seg_end_dist: None
+        
+        # Arc plane as plain floats for the connection points
+        cx, cy, cz = center.X, center.Y, center.Z
+        xx, xy, xz = x_dir.X, x_dir.Y, x_dir.Z
+        yx, yy, yz = y_dir.X, y_dir.Y, y_dir.Z
+        
+        def arc_point(arc_radius, angle):
+            cos_r = arc_radius * math.cos(angle)
+            sin_r = arc_radius * math.sin(angle)
+            return XYZ(cx + cos_r * xx + sin_r * yx,
+                       cy + cos_r * xy + sin_r * yy,
+                       cz + cos_r * xz + sin_r * yz)
+        
+        def build_arc_segment(seg_start_dist, seg_end_dist):
+            # Calculate arc parameters
+            start_param = max(0.0, min(1.0, seg_start_dist / line_length))
+            end_param = max(0.0, min(1.0, seg_end_dist / line_length))
+            
+            if end_param - start_param <= 0.001:
+                return None
+            
+            seg_start_angle = full_start + (start_param * param_range)
+            seg_end_angle = full_start + (end_param * param_range)
+            
+            # Create outer and inner arcs
+            outer_arc = Arc.Create(center, outer_radius, seg_start_angle, seg_end_angle, x_dir, y_dir)
+            inner_arc = Arc.Create(center, inner_radius, seg_start_angle, seg_end_angle, x_dir, y_dir)
+            
+            # Get connection points from the segment angles instead of evaluating the new arcs
+            start_outer = arc_point(outer_radius, seg_start_angle)
+            start_inner = arc_point(inner_radius, seg_start_angle)
+            end_outer = arc_point(outer_radius, seg_end_angle)
+            end_inner = arc_point(inner_radius, seg_end_angle)
+            
+            # Create closed loop in the line's buffer
+            return make_curve_loop(curves, [
+                outer_arc,
+                Line.CreateBound(end_outer, end_inner),
+                inner_arc.CreateReversed(),
+                Line.CreateBound(start_inner, start_outer),
+            ])
+        
+        return build_arc_segment
+    
+    return lambda seg_start_dist, seg_end_dist: None
+
+
+def format_segment_error(idx, err):
+    """Format a split segment error, idx is the get_segment_ranges index (None for the last segment)"""
+    if idx is None:
+        return "      Last segment error: {}".format(str(err))
+    return "      Segment {} error: {}".format(idx, str(err))
+
+
+def create_floors(profiles, slab_type_id, level_id):
+    """
+    Create one floor per (index, CurveLoop) profile in SubTransaction batches of FLOOR_BATCH_SIZE.
+    A failing batch is rolled back and retried one profile at a time; returns (floors, errors)
+    where errors are (index, exception) with the index the profile was given
+    """
+    # Floor.Create copies its profile, so one single-loop list is reused for every floor
+    loop_buffer = CurveLoopList()
+    loop_buffer.Add(None)
+    
+    def create_floor(profile):
+        loop_buffer[0] = profile
+        return Floor.Create(doc, loop_buffer, slab_type_id, level_id)
+    
+    floors = []
+    errors = []
+    for batch_start in range(0, len(profiles), FLOOR_BATCH_SIZE):
+        batch = profiles[batch_start:batch_start + FLOOR_BATCH_SIZE]
+        
+        sub_t = SubTransaction(doc)
+        sub_t.Start()
+        try:
+            created = [create_floor(profile) for _, profile in batch]
+            sub_t.Commit()
+            floors.extend(floor for floor in created if floor)
+            continue
+        except Exception:
+            sub_t.RollBack()
+        
+        # Retry the failed batch profile by profile so one bad loop only skips its own floor
+        for idx, profile in batch:
+            try:
+                floor = create_floor(profile)
+                if floor:
+                    floors.append(floor)
+            except Exception as seg_err:
+                errors.append((idx, seg_err))
+    
+    return floors, errors
+
+
+# ==============================================================================
+# FAILURE HANDLING
+# ==============================================================================
+
+class WarningSwallower(IFailuresPreprocessor):
+    """Delete warnings raised while creating slabs so they do not interrupt the batch"""
+    def PreprocessFailures(self, failures_accessor):
+        for failure in failures_accessor.GetFailureMessages():
+            if failure.GetSeverity() == FailureSeverity.Warning:
+                failures_accessor.DeleteWarning(failure)
+        return FailureProcessingResult.Continue
+
+
 # ==============================================================================
 # LINE SELECTION FILTER
 # ==============================================================================
@@ -152,17 +542,18 @@ class LineSelectionFilter(ISelectionFilter):
     """Filter to only allow line selection"""
     def __init__(self, line_category_id):
         self.line_category_id = line_category_id
+        # Compared against every element Revit offers, so unwrap the id once
+        self.line_category_int = line_category_id.IntegerValue
     
     def AllowElement(self, element):
         """Check if element is a line"""
         try:
-            if element.Category and element.Category.Id.IntegerValue == self.line_category_id.IntegerValue:
-                if hasattr(element, 'GeometryCurve'):
-                    curve = element.GeometryCurve
-                    if curve:
-                        return True
-            return False
-        except:
+            # Category mismatch is the common reject, test it before touching the geometry
+            category = element.Category
+            if not category or category.Id.IntegerValue != self.line_category_int:
+                return False
+            return getattr(element, 'GeometryCurve', None) is not None
+        except (AttributeError, RevitInvalidOperationException):
             return False
     
     def AllowReference(self, ref, point):
@@ -175,33 +566,17 @@ class LineSelectionFilter(ISelectionFilter):
 
 class SlabFromLineWindow(Window):
     def __init__(self, xaml_path, script_dir):
-        stream = StreamReader(xaml_path)
-        self._window = XamlReader.Load(stream.BaseStream)
-        stream.Close()
+        self._window = XamlReader.Parse(get_xaml_text(xaml_path))
         
         self.script_dir = script_dir
         self.line_types = {}
         self.slab_types = {}
         self.levels = {}
         
-        # Get controls
-        self.imgLogo = self._window.FindName("imgLogo")
-        self.btnClose = self._window.FindName("btnClose")
-        self.cmbLineType = self._window.FindName("cmbLineType")
-        self.cmbSlabType = self._window.FindName("cmbSlabType")
-        self.cmbLevel = self._window.FindName("cmbLevel")
-        self.txtOffsetFeet = self._window.FindName("txtOffsetFeet")
-        self.txtOffsetInches = self._window.FindName("txtOffsetInches")
-        self.txtLeftWidthFeet = self._window.FindName("txtLeftWidthFeet")
-        self.txtLeftWidthInches = self._window.FindName("txtLeftWidthInches")
-        self.txtRightWidthFeet = self._window.FindName("txtRightWidthFeet")
-        self.txtRightWidthInches = self._window.FindName("txtRightWidthInches")
-        self.chkSplitSlab = self._window.FindName("chkSplitSlab")
-        self.txtIntervalFeet = self._window.FindName("txtIntervalFeet")
-        self.txtIntervalInches = self._window.FindName("txtIntervalInches")
-        self.txtJointGap = self._window.FindName("txtJointGap")
-        self.txtStatus = self._window.FindName("txtStatus")
-        self.btnCreateSlabs = self._window.FindName("btnCreateSlabs")
+        # Get controls, resolving the window's name scope once for all of them
+        name_scope = NameScope.GetNameScope(self._window)
+        for name in CONTROL_NAMES:
+            setattr(self, name, name_scope.FindName(name))
         
         self.LoadLogo()
         self.LoadLineTypes()
@@ -212,143 +587,87 @@ class SlabFromLineWindow(Window):
     def LoadLogo(self):
         """Load BA logo"""
         try:
-            import System.Windows.Media.Imaging as Imaging
-            
-            logo_path = os.path.join(self.script_dir, "BA_logo.png")
-            if not os.path.exists(logo_path):
-                logo_path = os.path.join(self.script_dir, "icon.png")
-            
-            if os.path.exists(logo_path):
-                bitmap = Imaging.BitmapImage()
-                bitmap.BeginInit()
-                bitmap.UriSource = System.Uri(logo_path)
-                bitmap.CacheOption = Imaging.BitmapCacheOption.OnLoad
-                bitmap.EndInit()
+            bitmap = load_logo(self.script_dir)
+            if bitmap is not None:
                 self.imgLogo.Source = bitmap
         except:
             pass
     
+    def FillComboBox(self, combo, pairs, lookup):
+        """Bind (name, ElementId) pairs to a combo box in one assignment and select the first"""
+        lookup.update(pairs)
+        combo.ItemsSource = [name for name, _ in pairs]
+        if combo.Items.Count > 0:
+            combo.SelectedIndex = 0
+    
     def LoadLineTypes(self):
         try:
-            categories = doc.Settings.Categories
-            line_categories = [
-                (BuiltInCategory.OST_Lines, "Model Lines"),
-                (BuiltInCategory.OST_SketchLines, "Sketch Lines"),
-                (BuiltInCategory.OST_RoomSeparationLines, "Room Separation Lines"),
-            ]
-            for cat_id, cat_name in line_categories:
-                try:
-                    category = categories.get_Item(cat_id)
-                    if category:
-                        self.cmbLineType.Items.Add(cat_name)
-                        self.line_types[cat_name] = category.Id
-                except:
-                    pass
-            if self.cmbLineType.Items.Count > 0:
-                self.cmbLineType.SelectedIndex = 0
+            line_types = get_cached_lookup("LineTypes", doc.Settings.Categories.Size, collect_line_types)
+            self.FillComboBox(self.cmbLineType, line_types, self.line_types)
         except Exception as e:
             output.print_md("Error: {}".format(str(e)))
     
     def LoadSlabTypes(self):
         try:
-            floor_types = FilteredElementCollector(doc).OfClass(FloorType).ToElements()
-            for ft in sorted(floor_types, key=lambda x: x.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_AND_TYPE_NAMES_PARAM).AsString()):
-                slab_name = ft.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_AND_TYPE_NAMES_PARAM).AsString()
-                self.cmbSlabType.Items.Add(slab_name)
-                self.slab_types[slab_name] = ft.Id
-            if self.cmbSlabType.Items.Count > 0:
-                self.cmbSlabType.SelectedIndex = 0
+            # Collected on every open, cached names would go stale on renamed or replaced types
+            slab_types = collect_slab_types()
+            self.FillComboBox(self.cmbSlabType, slab_types, self.slab_types)
         except Exception as e:
             output.print_md("Error: {}".format(str(e)))
     
     def LoadLevels(self):
         try:
-            levels = FilteredElementCollector(doc).OfClass(Level).ToElements()
-            sorted_levels = sorted(levels, key=lambda x: x.Elevation)
-            for level in sorted_levels:
-                level_name = level.Name
-                self.cmbLevel.Items.Add(level_name)
-                self.levels[level_name] = level.Id
-            if self.cmbLevel.Items.Count > 0:
-                self.cmbLevel.SelectedIndex = 0
+            levels = collect_levels()
+            self.FillComboBox(self.cmbLevel, levels, self.levels)
         except Exception as e:
             output.print_md("Error: {}".format(str(e)))
     
     def CreateSlabs(self):
-        if not self.cmbLineType.SelectedItem:
+        # Read each selection once, the values are reused below
+        selected_line_type = self.cmbLineType.SelectedItem
+        selected_slab_type = self.cmbSlabType.SelectedItem
+        selected_level = self.cmbLevel.SelectedItem
+        
+        if not selected_line_type:
             TaskDialog.Show("Error", "Please select a line type")
             return
-        if not self.cmbSlabType.SelectedItem:
+        if not selected_slab_type:
             TaskDialog.Show("Error", "Please select a slab type")
             return
-        if not self.cmbLevel.SelectedItem:
+        if not selected_level:
             TaskDialog.Show("Error", "Please select a level")
             return
         
-        line_type_name = str(self.cmbLineType.SelectedItem)
-        slab_type_name = str(self.cmbSlabType.SelectedItem)
-        level_name = str(self.cmbLevel.SelectedItem)
+        line_type_name = str(selected_line_type)
+        slab_type_name = str(selected_slab_type)
+        level_name = str(selected_level)
         split_enabled = self.chkSplitSlab.IsChecked == True
         
-        # Get offset
-        try:
-            offset_feet = float(self.txtOffsetFeet.Text)
-        except:
-            TaskDialog.Show("Error", "Invalid offset feet value")
-            return
-        
-        try:
-            offset_inches = float(self.txtOffsetInches.Text)
-            if offset_inches < 0 or offset_inches >= 12:
-                TaskDialog.Show("Error", "Offset inches must be between 0 and 11.99")
-                return
-        except:
-            TaskDialog.Show("Error", "Invalid offset inches value")
-            return
-        
-        offset_ft = offset_feet + (offset_inches / 12.0)
-        
-        # Get left width
-        try:
-            left_feet = float(self.txtLeftWidthFeet.Text)
-            if left_feet < 0:
-                TaskDialog.Show("Error", "Left width cannot be negative")
-                return
-        except:
-            TaskDialog.Show("Error", "Invalid left width feet value")
-            return
-        
-        try:
-            left_inches = float(self.txtLeftWidthInches.Text)
-            if left_inches < 0 or left_inches >= 12:
-                TaskDialog.Show("Error", "Left width inches must be between 0 and 11.99")
-                return
-        except:
-            TaskDialog.Show("Error", "Invalid left width inches value")
-            return
-        
-        left_width_ft = left_feet + (left_inches / 12.0)
-        
-        # Get right width
-        try:
-            right_feet = float(self.txtRightWidthFeet.Text)
-            if right_feet < 0:
-                TaskDialog.Show("Error", "Right width cannot be negative")
-                return
-        except:
-            TaskDialog.Show("Error", "Invalid right width feet value")
-            return
+        # (textbox, name, minimum, exclusive maximum, out of range message) of each numeric input
+        inches_range = "must be between 0 and 11.99"
+        fields = [
+            (self.txtOffsetFeet, "offset feet", None, None, None),
+            (self.txtOffsetInches, "offset inches", 0.0, 12.0, "Offset inches " + inches_range),
+            (self.txtLeftWidthFeet, "left width feet", 0.0, None, "Left width cannot be negative"),
+            (self.txtLeftWidthInches, "left width inches", 0.0, 12.0, "Left width inches " + inches_range),
+            (self.txtRightWidthFeet, "right width feet", 0.0, None, "Right width cannot be negative"),
+            (self.txtRightWidthInches, "right width inches", 0.0, 12.0, "Right width inches " + inches_range),
+        ]
+        if split_enabled:
+            fields.extend([
+                (self.txtIntervalFeet, "interval feet", 0.0, None, "Interval feet cannot be negative"),
+                (self.txtIntervalInches, "interval inches", 0.0, 12.0, "Interval inches " + inches_range),
+                (self.txtJointGap, "joint gap", 0.0, None, "Joint gap cannot be negative"),
+            ])
         
-        try:
-            right_inches = float(self.txtRightWidthInches.Text)
-            if right_inches < 0 or right_inches >= 12:
-                TaskDialog.Show("Error", "Right width inches must be between 0 and 11.99")
-                return
-        except:
-            TaskDialog.Show("Error", "Invalid right width inches value")
+        values, error = parse_number_fields(fields)
+        if error:
+            TaskDialog.Show("Error", error)
             return
         
-        right_width_ft = right_feet + (right_inches / 12.0)
+        offset_ft = values[0] + (values[1] / 12.0)
+        left_width_ft = values[2] + (values[3] / 12.0)
+        right_width_ft = values[4] + (values[5] / 12.0)
         
         if left_width_ft + right_width_ft <= 0:
             TaskDialog.Show("Error", "Total slab width must be greater than 0")
@@ -359,39 +678,13 @@ class SlabFromLineWindow(Window):
         joint_gap_ft = 0.0
         
         if split_enabled:
-            try:
-                feet = float(self.txtIntervalFeet.Text)
-                if feet < 0:
-                    TaskDialog.Show("Error", "Interval feet cannot be negative")
-                    return
-            except:
-                TaskDialog.Show("Error", "Invalid interval feet value")
-                return
-            
-            try:
-                inches = float(self.txtIntervalInches.Text)
-                if inches < 0 or inches >= 12:
-                    TaskDialog.Show("Error", "Interval inches must be between 0 and 11.99")
-                    return
-            except:
-                TaskDialog.Show("Error", "Invalid interval inches value")
-                return
-            
-            interval_ft = feet + (inches / 12.0)
+            interval_ft = values[6] + (values[7] / 12.0)
             
             if interval_ft <= 0:
                 TaskDialog.Show("Error", "Interval must be greater than 0")
                 return
             
-            try:
-                gap_inches = float(self.txtJointGap.Text)
-                if gap_inches < 0:
-                    TaskDialog.Show("Error", "Joint gap cannot be negative")
-                    return
-                joint_gap_ft = gap_inches / 12.0
-            except:
-                TaskDialog.Show("Error", "Invalid joint gap value")
-                return
+            joint_gap_ft = values[8] / 12.0
         
         line_category_id = self.line_types[line_type_name]
         slab_type_id = self.slab_types[slab_type_name]
@@ -428,41 +721,56 @@ class SlabFromLineWindow(Window):
             output.print_md("Selected {} lines".format(len(selection)))
             output.print_md("")
             
+            # Resolve each picked line, its curve and length once for every step below
+            picked_lines = []
+            for ref in selection:
+                line_element = doc.GetElement(ref.ElementId)
+                line_curve = None
+                if line_element and hasattr(line_element, 'GeometryCurve'):
+                    line_curve = line_element.GeometryCurve
+                line_length = line_curve.Length if line_curve else 0.0
+                picked_lines.append((line_element, line_curve, line_length))
+            
             total_slabs = 0
             failed = 0
             
             # STEP 1: Create slabs for all selected lines first (NO splitting yet)
             with Transaction(doc, "Create Slabs from Lines") as t:
                 t.Start()
+                options = t.GetFailureHandlingOptions()
+                options.SetFailuresPreprocessor(WarningSwallower())
+                options.SetClearAfterRollback(True)
+                options.SetForcedModalHandling(False)
+                t.SetFailureHandlingOptions(options)
                 
-                created_slabs_map = {}
+                # Slab created for each picked line, by the line's position in picked_lines
+                created_slabs = [None] * len(picked_lines)
+                created_count = 0
+                # Widths are fixed for the run, so a profile shape only depends on the curve
+                profile_cache = {}
+                # Segment errors are written in one block after the transaction
+                segment_errors = []
                 
-                for ref in selection:
-                    line_element = doc.GetElement(ref.ElementId)
-                    slabs, msg = CreateSlabFromLine(line_element, slab_type_id, level_id, 
-                                                   offset_ft, left_width_ft, right_width_ft, doc)
+                for line_idx, (line_element, line_curve, line_length) in enumerate(picked_lines):
+                    slabs, msg = CreateSlabFromLine(line_curve, slab_type_id, level_id, 
+                                                   offset_ft, left_width_ft, right_width_ft, doc,
+                                                   profile_cache)
                     if slabs and len(slabs) > 0:
-                        created_slabs_map[line_element.Id] = slabs
+                        created_slabs[line_idx] = slabs[0]
+                        created_count += 1
                         output.print_md("✅ Slab created from line {}".format(line_element.Id))
                     else:
                         failed += 1
                         output.print_md("❌ Failed for line {}: {}".format(line_element.Id, msg))
                 
-                doc.Regenerate()
-                
                 # STEP 2: If splitting is enabled, split based on TOTAL line length
-                if split_enabled and len(created_slabs_map) > 0:
+                # Only slab ids and the curves resolved at selection are used, so no regenerate is needed
+                if split_enabled and created_count > 0:
                     output.print_md("")
                     output.print_md("### Splitting slabs based on total line length...")
                     
                     # Calculate total line length
-                    total_line_length = 0.0
-                    for ref in selection:
-                        line_elem = doc.GetElement(ref.ElementId)
-                        if line_elem and hasattr(line_elem, 'GeometryCurve'):
-                            curve = line_elem.GeometryCurve
-                            if curve:
-                                total_line_length += curve.Length
+                    total_line_length = sum(line_length for _, _, line_length in picked_lines)
                     
                     output.print_md("  Total line length: {:.2f} ft".format(total_line_length))
                     
@@ -482,267 +790,91 @@ class SlabFromLineWindow(Window):
                         all_new_slabs = []
                         slabs_to_delete = []
                         
-                        for ref in selection:
-                            line_elem = doc.GetElement(ref.ElementId)
-                            if line_elem.Id not in created_slabs_map:
-                                continue
-                            
-                            slabs = created_slabs_map[line_elem.Id]
-                            if not slabs or len(slabs) == 0:
+                        # Split positions and segments both increase, so one index walks the positions once
+                        split_count = len(split_positions)
+                        split_idx = 0
+                        
+                        for line_idx, (line_elem, line_curve, line_length) in enumerate(picked_lines):
+                            slab = created_slabs[line_idx]
+                            if slab is None:
                                 continue
                             
-                            slab = slabs[0]
-                            line_curve = line_elem.GeometryCurve
-                            line_length = line_curve.Length
                             segment_start = cumulative_length
                             segment_end = cumulative_length + line_length
                             
                             # Find splits that fall within this line segment
-                            splits_in_this_segment = [sp for sp in split_positions 
-                                                     if segment_start < sp < segment_end]
+                            while split_idx < split_count and split_positions[split_idx] <= segment_start:
+                                split_idx += 1
+                            end_idx = split_idx
+                            while end_idx < split_count and split_positions[end_idx] < segment_end:
+                                end_idx += 1
+                            splits_in_this_segment = split_positions[split_idx:end_idx]
                             
                             if not splits_in_this_segment:
                                 # No splits in this segment, keep original slab
-                                all_new_slabs.extend(slabs)
+                                all_new_slabs.append(slab)
                             else:
                                 # Split this slab
                                 gap_inches = joint_gap_ft * 12.0
                                 output.print_md("    Splitting slab {} at {} positions (gap: {:.2f}\")".format(
                                     slab.Id, len(splits_in_this_segment), gap_inches))
                                 
-                                # Create sub-segments
-                                sub_slabs = []
-                                prev_distance = 0.0
+                                # Line/Arc dispatch happens once, the builder only takes segment distances
+                                build_segment = get_segment_builder(line_curve, line_length, left_width_ft, right_width_ft)
                                 
-                                for idx, split_pos in enumerate(splits_in_this_segment):
-                                    # Distance on THIS line where split should occur
-                                    distance_on_line = split_pos - segment_start
-                                    
-                                    # Create slab from prev_distance to (distance_on_line - gap/2)
+                                # Build every sub-segment profile first, slabs are created afterwards
+                                segment_loops = []  # (segment index, profile)
+                                
+                                for idx, seg_start_dist, seg_end_dist in get_segment_ranges(
+                                        splits_in_this_segment, segment_start, line_length, joint_gap_ft):
                                     try:
-                                        seg_start_dist = prev_distance
-                                        seg_end_dist = distance_on_line - joint_gap_ft/2.0
-                                        
-                                        if seg_end_dist - seg_start_dist > 0.01:
-                                            # Create offset curves for this segment
-                                            if isinstance(line_curve, Line):
-                                                start_pt = line_curve.GetEndPoint(0)
-                                                end_pt = line_curve.GetEndPoint(1)
-                                                direction = (end_pt - start_pt).Normalize()
-                                                perp = XYZ(-direction.Y, direction.X, 0).Normalize()
-                                                
-                                                # Segment points on centerline
-                                                seg_start_pt = start_pt + (direction * seg_start_dist)
-                                                seg_end_pt = start_pt + (direction * seg_end_dist)
-                                                
-                                                # Create left boundary
-                                                left_start = seg_start_pt + (perp * left_width_ft)
-                                                left_end = seg_end_pt + (perp * left_width_ft)
-                                                
-                                                # Create right boundary
-                                                right_start = seg_start_pt - (perp * right_width_ft)
-                                                right_end = seg_end_pt - (perp * right_width_ft)
-                                                
-                                                # Create closed loop
-                                                curves = List[Curve]()
-                                                curves.Add(Line.CreateBound(left_start, left_end))
-                                                curves.Add(Line.CreateBound(left_end, right_end))
-                                                curves.Add(Line.CreateBound(right_end, right_start))
-                                                curves.Add(Line.CreateBound(right_start, left_start))
-                                                
-                                                curve_loop = CurveLoop.Create(curves)
-                                                curve_loops = List[CurveLoop]()
-                                                curve_loops.Add(curve_loop)
-                                                
-                                                seg_slab = Floor.Create(doc, curve_loops, slab_type_id, level_id)
-                                                
-                                                if seg_slab:
-                                                    offset_param = seg_slab.get_Parameter(BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)
-                                                    if offset_param and not offset_param.IsReadOnly:
-                                                        offset_param.Set(offset_ft)
-                                                    sub_slabs.append(seg_slab)
-                                            
-                                            elif isinstance(line_curve, Arc):
-                                                arc = line_curve
-                                                center = arc.Center
-                                                radius = arc.Radius
-                                                
-                                                # Calculate arc parameters
-                                                start_param = seg_start_dist / line_length
-                                                end_param = seg_end_dist / line_length
-                                                
-                                                start_param = max(0.0, min(1.0, start_param))
-                                                end_param = max(0.0, min(1.0, end_param))
-                                                
-                                                if end_param - start_param > 0.001:
-                                                    full_start = arc.GetEndParameter(0)
-                                                    full_end = arc.GetEndParameter(1)
-                                                    param_range = full_end - full_start
-                                                    
-                                                    seg_start_angle = full_start + (start_param * param_range)
-                                                    seg_end_angle = full_start + (end_param * param_range)
-                                                    
-                                                    # Create outer and inner arcs
-                                                    outer_radius = radius + left_width_ft
-                                                    inner_radius = radius - right_width_ft
-                                                    
-                                                    if inner_radius > 0:
-                                                        outer_arc = Arc.Create(center, outer_radius, seg_start_angle, seg_end_angle,
-                                                                             arc.XDirection, arc.YDirection)
-                                                        inner_arc = Arc.Create(center, inner_radius, seg_start_angle, seg_end_angle,
-                                                                             arc.XDirection, arc.YDirection)
-                                                        
-                                                        # Get connection points
-                                                        start_outer = outer_arc.Evaluate(0.0, True)
-                                                        start_inner = inner_arc.Evaluate(0.0, True)
-                                                        end_outer = outer_arc.Evaluate(1.0, True)
-                                                        end_inner = inner_arc.Evaluate(1.0, True)
-                                                        
-                                                        # Create closed loop
-                                                        curves = List[Curve]()
-                                                        curves.Add(outer_arc)
-                                                        curves.Add(Line.CreateBound(end_outer, end_inner))
-                                                        curves.Add(inner_arc.CreateReversed())
-                                                        curves.Add(Line.CreateBound(start_inner, start_outer))
-                                                        
-                                                        curve_loop = CurveLoop.Create(curves)
-                                                        curve_loops = List[CurveLoop]()
-                                                        curve_loops.Add(curve_loop)
-                                                        
-                                                        seg_slab = Floor.Create(doc, curve_loops, slab_type_id, level_id)
-                                                        
-                                                        if seg_slab:
-                                                            offset_param = seg_slab.get_Parameter(BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)
-                                                            if offset_param and not offset_param.IsReadOnly:
-                                                                offset_param.Set(offset_ft)
-                                                            sub_slabs.append(seg_slab)
+                                        profile = build_segment(seg_start_dist, seg_end_dist)
+                                        if profile:
+                                            segment_loops.append((idx, profile))
                                     
                                     except Exception as seg_err:
-                                        output.print_md("      Segment {} error: {}".format(idx, str(seg_err)))
-                                    
-                                    # Next segment starts AFTER the gap
-                                    prev_distance = distance_on_line + joint_gap_ft/2.0
+                                        segment_errors.append(format_segment_error(idx, seg_err))
                                 
-                                # Last segment from last split to end
-                                if prev_distance < line_length:
-                                    try:
-                                        seg_start_dist = prev_distance
-                                        seg_end_dist = line_length
-                                        
-                                        if seg_end_dist - seg_start_dist > 0.01:
-                                            if isinstance(line_curve, Line):
-                                                start_pt = line_curve.GetEndPoint(0)
-                                                end_pt = line_curve.GetEndPoint(1)
-                                                direction = (end_pt - start_pt).Normalize()
-                                                perp = XYZ(-direction.Y, direction.X, 0).Normalize()
-                                                
-                                                seg_start_pt = start_pt + (direction * seg_start_dist)
-                                                seg_end_pt = end_pt
-                                                
-                                                left_start = seg_start_pt + (perp * left_width_ft)
-                                                left_end = seg_end_pt + (perp * left_width_ft)
-                                                right_start = seg_start_pt - (perp * right_width_ft)
-                                                right_end = seg_end_pt - (perp * right_width_ft)
-                                                
-                                                curves = List[Curve]()
-                                                curves.Add(Line.CreateBound(left_start, left_end))
-                                                curves.Add(Line.CreateBound(left_end, right_end))
-                                                curves.Add(Line.CreateBound(right_end, right_start))
-                                                curves.Add(Line.CreateBound(right_start, left_start))
-                                                
-                                                curve_loop = CurveLoop.Create(curves)
-                                                curve_loops = List[CurveLoop]()
-                                                curve_loops.Add(curve_loop)
-                                                
-                                                seg_slab = Floor.Create(doc, curve_loops, slab_type_id, level_id)
-                                                
-                                                if seg_slab:
-                                                    offset_param = seg_slab.get_Parameter(BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)
-                                                    if offset_param and not offset_param.IsReadOnly:
-                                                        offset_param.Set(offset_ft)
-                                                    sub_slabs.append(seg_slab)
-                                            
-                                            elif isinstance(line_curve, Arc):
-                                                arc = line_curve
-                                                center = arc.Center
-                                                radius = arc.Radius
-                                                
-                                                start_param = seg_start_dist / line_length
-                                                end_param = 1.0
-                                                
-                                                start_param = max(0.0, min(1.0, start_param))
-                                                
-                                                if end_param - start_param > 0.001:
-                                                    full_start = arc.GetEndParameter(0)
-                                                    full_end = arc.GetEndParameter(1)
-                                                    param_range = full_end - full_start
-                                                    
-                                                    seg_start_angle = full_start + (start_param * param_range)
-                                                    seg_end_angle = full_end
-                                                    
-                                                    outer_radius = radius + left_width_ft
-                                                    inner_radius = radius - right_width_ft
-                                                    
-                                                    if inner_radius > 0:
-                                                        outer_arc = Arc.Create(center, outer_radius, seg_start_angle, seg_end_angle,
-                                                                             arc.XDirection, arc.YDirection)
-                                                        inner_arc = Arc.Create(center, inner_radius, seg_start_angle, seg_end_angle,
-                                                                             arc.XDirection, arc.YDirection)
-                                                        
-                                                        start_outer = outer_arc.Evaluate(0.0, True)
-                                                        start_inner = inner_arc.Evaluate(0.0, True)
-                                                        end_outer = outer_arc.Evaluate(1.0, True)
-                                                        end_inner = inner_arc.Evaluate(1.0, True)
-                                                        
-                                                        curves = List[Curve]()
-                                                        curves.Add(outer_arc)
-                                                        curves.Add(Line.CreateBound(end_outer, end_inner))
-                                                        curves.Add(inner_arc.CreateReversed())
-                                                        curves.Add(Line.CreateBound(start_inner, start_outer))
-                                                        
-                                                        curve_loop = CurveLoop.Create(curves)
-                                                        curve_loops = List[CurveLoop]()
-                                                        curve_loops.Add(curve_loop)
-                                                        
-                                                        seg_slab = Floor.Create(doc, curve_loops, slab_type_id, level_id)
-                                                        
-                                                        if seg_slab:
-                                                            offset_param = seg_slab.get_Parameter(BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)
-                                                            if offset_param and not offset_param.IsReadOnly:
-                                                                offset_param.Set(offset_ft)
-                                                            sub_slabs.append(seg_slab)
-                                    
-                                    except Exception as last_err:
-                                        output.print_md("      Last segment error: {}".format(str(last_err)))
+                                # Create all sub-segment slabs, then set their offsets in one pass
+                                sub_slabs, create_errors = create_floors(segment_loops, slab_type_id, level_id)
+                                for idx, seg_err in create_errors:
+                                    segment_errors.append(format_segment_error(idx, seg_err))
+                                
+                                for seg_slab in sub_slabs:
+                                    offset_param = seg_slab.get_Parameter(BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)
+                                    if offset_param and not offset_param.IsReadOnly:
+                                        offset_param.Set(offset_ft)
                                 
                                 if sub_slabs:
                                     all_new_slabs.extend(sub_slabs)
                                     slabs_to_delete.append(slab)
                                 else:
-                                    all_new_slabs.extend(slabs)
+                                    all_new_slabs.append(slab)
                             
                             cumulative_length += line_length
                         
-                        # Delete original slabs that were split
-                        for slab in slabs_to_delete:
+                        # Delete original slabs that were split, all in one call
+                        if slabs_to_delete:
                             try:
-                                doc.Delete(slab.Id)
-                            except:
+                                doc.Delete(List[ElementId]([slab.Id for slab in slabs_to_delete]))
+                            except RevitArgumentException:
+                                # An element that is already gone or cannot be deleted
                                 pass
                         
                         total_slabs = len(all_new_slabs)
                         output.print_md("  Final: {} slab segments created".format(total_slabs))
                     else:
                         # Not long enough to split
-                        for slabs_list in created_slabs_map.values():
-                            total_slabs += len(slabs_list)
+                        total_slabs = created_count
                 else:
                     # No splitting, just count slabs
-                    for slabs_list in created_slabs_map.values():
-                        total_slabs += len(slabs_list)
+                    total_slabs = created_count
                 
                 t.Commit()
             
+            if segment_errors:
+                output.print_md("\n\n".join(segment_errors))
+            
             output.print_md("")
             output.print_md("---")
             output.print_md("### Summary")
@@ -753,7 +885,6 @@ class SlabFromLineWindow(Window):
             
         except Exception as e:
             output.print_md("❌ Error: {}".format(str(e)))
-            import traceback
             output.print_md("```\n{}\n```".format(traceback.format_exc()))
     
     def SetupEventHandlers(self):
@@ -785,5 +916,4 @@ try:
     window.ShowDialog()
 except Exception as e:
     forms.alert("Error: {}".format(str(e)))
-    import traceback
     output.print_md("```\n{}\n```".format(traceback.format_exc()))
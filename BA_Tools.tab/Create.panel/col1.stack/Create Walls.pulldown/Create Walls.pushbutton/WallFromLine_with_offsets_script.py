@@ -6,8 +6,10 @@ Create walls from selected lines with specified wall type and levels
 __title__ = 'Wall from\nLine'
 __doc__ = 'Create walls from lines'
 
+import bisect
 import clr
 import os
+import traceback
 
 clr.AddReference("RevitAPI")
 clr.AddReference("RevitAPIUI")
@@ -19,63 +21,60 @@ clr.AddReference("System.Xaml")
 from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import *
 from Autodesk.Revit.UI.Selection import ObjectType, ISelectionFilter
+from Autodesk.Revit.Exceptions import ArgumentException as RevitArgumentException, InvalidOperationException as RevitInvalidOperationException
 from pyrevit import script, forms
 import System
 from System.Windows.Markup import XamlReader
 from System.Windows import Window
 from System.IO import StreamReader
+from System.Collections.Generic import List
 
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
 output = script.get_output()
 
+# Wall location names offered in the window and their location lines
+LOCATION_LINE_MAP = {
+    "Wall Centerline": WallLocationLine.WallCenterline,
+    "Finish Face: Exterior": WallLocationLine.FinishFaceExterior,
+    "Finish Face: Interior": WallLocationLine.FinishFaceInterior,
+    "Core Centerline": WallLocationLine.CoreCenterline,
+    "Core Face: Exterior": WallLocationLine.CoreExterior,
+    "Core Face: Interior": WallLocationLine.CoreInterior
+}
+
+# Location names whose walls are created flipped
+INTERIOR_LOCATIONS = frozenset(["Finish Face: Interior", "Core Face: Interior"])
+
 
 # ==============================================================================
 # WALL CREATION FUNCTION
 # ==============================================================================
 
-def CreateWallFromLine(line_element, wall_type_id, base_level_id, top_level_id, 
-                      base_offset_ft, top_offset_ft, wall_location, split_enabled, 
+def get_location_line(wall_location):
+    """Get the WallLocationLine for a location name and whether the wall is flipped"""
+    location_line = LOCATION_LINE_MAP.get(wall_location, WallLocationLine.WallCenterline)
+    flip_wall = wall_location in INTERIOR_LOCATIONS
+    return location_line, flip_wall
+
+
+def CreateWallFromLine(location_curve, wall_type_id, base_level_id, top_level_id, wall_height,
+                      base_offset_ft, top_offset_ft, location_line, flip_wall, split_enabled, 
                       interval_ft, joint_gap_ft, doc):
     """
-    Create wall from line (no splitting here - handled at higher level)
+    Create wall from a line's curve (no splitting here - handled at higher level).
+    The curve is the one resolved at selection, so it is not read back from the line element.
+    wall_height is computed once per run from the level elevations and offsets;
+    location_line and flip_wall come from get_location_line, resolved once per run
     """
     try:
-        # Get the line geometry
-        location_curve = line_element.GeometryCurve
-        
         if not location_curve:
             return [], "No curve found"
         
-        # Get levels
-        base_level = doc.GetElement(base_level_id)
-        top_level = doc.GetElement(top_level_id)
-        
-        if not base_level or not top_level:
-            return [], "Invalid levels"
-        
-        # Calculate height (including offsets)
-        base_elevation = base_level.Elevation + base_offset_ft
-        top_elevation = top_level.Elevation + top_offset_ft
-        wall_height = top_elevation - base_elevation
-        
         if wall_height <= 0:
             return [], "Top level + offset must be higher than base level + offset"
         
-        # Get wall location line value
-        location_line_map = {
-            "Wall Centerline": WallLocationLine.WallCenterline,
-            "Finish Face: Exterior": WallLocationLine.FinishFaceExterior,
-            "Finish Face: Interior": WallLocationLine.FinishFaceInterior,
-            "Core Centerline": WallLocationLine.CoreCenterline,
-            "Core Face: Exterior": WallLocationLine.CoreExterior,
-            "Core Face: Interior": WallLocationLine.CoreInterior
-        }
-        
-        location_line = location_line_map.get(wall_location, WallLocationLine.WallCenterline)
-        flip_wall = "Interior" in wall_location
-        
         # Create the wall
         wall = Wall.Create(doc, location_curve, wall_type_id, base_level_id, wall_height, base_offset_ft, flip_wall, False)
         
@@ -103,6 +102,19 @@ def CreateWallFromLine(line_element, wall_type_id, base_level_id, top_level_id,
         return [], str(e)
 
 
+# ==============================================================================
+# FAILURE HANDLING
+# ==============================================================================
+
+class WarningSwallower(IFailuresPreprocessor):
+    """Delete warnings raised while creating walls so they do not interrupt the batch"""
+    def PreprocessFailures(self, failures_accessor):
+        for failure in failures_accessor.GetFailureMessages():
+            if failure.GetSeverity() == FailureSeverity.Warning:
+                failures_accessor.DeleteWarning(failure)
+        return FailureProcessingResult.Continue
+
+
 # ==============================================================================
 # LINE SELECTION FILTER
 # ==============================================================================
@@ -111,17 +123,18 @@ class LineSelectionFilter(ISelectionFilter):
     """Filter to only allow line selection"""
     def __init__(self, line_category_id):
         self.line_category_id = line_category_id
+        # Compared against every element Revit offers, so unwrap the id once
+        self.line_category_int = line_category_id.IntegerValue
     
     def AllowElement(self, element):
         """Check if element is a line"""
         try:
-            if element.Category and element.Category.Id.IntegerValue == self.line_category_id.IntegerValue:
-                if hasattr(element, 'GeometryCurve'):
-                    curve = element.GeometryCurve
-                    if curve:
-                        return True
-            return False
-        except:
+            # Category mismatch is the common reject, test it before touching the geometry
+            category = element.Category
+            if not category or category.Id.IntegerValue != self.line_category_int:
+                return False
+            return getattr(element, 'GeometryCurve', None) is not None
+        except (AttributeError, RevitInvalidOperationException):
             return False
     
     def AllowReference(self, ref, point):
@@ -142,6 +155,7 @@ class WallFromLineWindow(Window):
         self.line_types = {}
         self.wall_types = {}
         self.levels = {}
+        self.level_elements = {}
         
         # Get controls
         self.imgLogo = self._window.FindName("imgLogo")
@@ -208,11 +222,13 @@ class WallFromLineWindow(Window):
     
     def LoadWallTypes(self):
         try:
-            wall_types = FilteredElementCollector(doc).OfClass(WallType).ToElements()
-            for wt in sorted(wall_types, key=lambda x: x.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_AND_TYPE_NAMES_PARAM).AsString()):
-                wall_name = wt.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_AND_TYPE_NAMES_PARAM).AsString()
+            # Read each type name once, then sort the (name, id) pairs
+            wall_types = [(wt.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_AND_TYPE_NAMES_PARAM).AsString(), wt.Id)
+                          for wt in FilteredElementCollector(doc).OfClass(WallType)]
+            wall_types.sort(key=lambda pair: pair[0])
+            for wall_name, wall_type_id in wall_types:
                 self.cmbWallType.Items.Add(wall_name)
-                self.wall_types[wall_name] = wt.Id
+                self.wall_types[wall_name] = wall_type_id
             if self.cmbWallType.Items.Count > 0:
                 self.cmbWallType.SelectedIndex = 0
         except Exception as e:
@@ -227,6 +243,7 @@ class WallFromLineWindow(Window):
                 self.cmbBaseLevel.Items.Add(level_name)
                 self.cmbTopLevel.Items.Add(level_name)
                 self.levels[level_name] = level.Id
+                self.level_elements[level_name] = level
             if self.cmbBaseLevel.Items.Count > 0:
                 self.cmbBaseLevel.SelectedIndex = 0
             if self.cmbTopLevel.Items.Count > 1:
@@ -313,6 +330,19 @@ class WallFromLineWindow(Window):
         wall_type_id = self.wall_types[wall_type_name]
         base_level_id = self.levels[base_level_name]
         top_level_id = self.levels[top_level_name]
+        # Elevations are read once from the LoadLevels elements, never per line
+        base_elevation = self.level_elements[base_level_name].Elevation + base_offset_ft
+        top_elevation = self.level_elements[top_level_name].Elevation + top_offset_ft
+        
+        # Height is the same for every wall, reject inverted levels before anything is picked
+        wall_height = top_elevation - base_elevation
+        if wall_height <= 0:
+            TaskDialog.Show("Error", "Top level + offset must be higher than base level + offset")
+            return
+        
+        # Location line and flip are the same for every wall of the run
+        location_line, flip_wall = get_location_line(wall_location)
+        location_line_value = int(location_line)
         
         self._window.Close()
         
@@ -348,20 +378,43 @@ class WallFromLineWindow(Window):
             total_walls = 0
             failed = 0
             
+            # Resolve the picked lines and their curves once, lines without geometry never reach the transaction
+            picked_lines = []  # (line element, curve)
+            total_line_length = 0.0
+            for ref in selection:
+                line_element = doc.GetElement(ref.ElementId)
+                curve = getattr(line_element, 'GeometryCurve', None) if line_element else None
+                if curve:
+                    picked_lines.append((line_element, curve))
+                    total_line_length += curve.Length
+                else:
+                    failed += 1
+                    output.print_md("❌ Failed for line {}: No curve found".format(ref.ElementId))
+            
+            if not picked_lines:
+                output.print_md("No valid lines selected")
+                return
+            
             # STEP 1: Create walls for all selected lines first (NO splitting yet)
             with Transaction(doc, "Create Walls from Lines") as t:
                 t.Start()
+                options = t.GetFailureHandlingOptions()
+                options.SetFailuresPreprocessor(WarningSwallower())
+                options.SetClearAfterRollback(True)
+                options.SetForcedModalHandling(False)
+                t.SetFailureHandlingOptions(options)
                 
                 created_walls_map = {}  # Map line_id -> wall list
+                created_count = 0  # Walls in created_walls_map, kept as they are added
                 
-                for ref in selection:
-                    line_element = doc.GetElement(ref.ElementId)
+                for line_element, curve in picked_lines:
                     # Create wall WITHOUT splitting
-                    walls, msg = CreateWallFromLine(line_element, wall_type_id, base_level_id, top_level_id,
-                                                   base_offset_ft, top_offset_ft, wall_location, 
+                    walls, msg = CreateWallFromLine(curve, wall_type_id, base_level_id, top_level_id,
+                                                   wall_height, base_offset_ft, top_offset_ft, location_line, flip_wall,
                                                    False, interval_ft, joint_gap_ft, doc)
                     if walls and len(walls) > 0:
                         created_walls_map[line_element.Id] = walls
+                        created_count += len(walls)
                         output.print_md("✅ Wall created from line {}".format(line_element.Id))
                     else:
                         failed += 1
@@ -374,25 +427,15 @@ class WallFromLineWindow(Window):
                     output.print_md("")
                     output.print_md("### Splitting walls based on total line length...")
                     
-                    # Calculate total line length
-                    total_line_length = 0.0
-                    for ref in selection:
-                        line_elem = doc.GetElement(ref.ElementId)
-                        if line_elem and hasattr(line_elem, 'GeometryCurve'):
-                            curve = line_elem.GeometryCurve
-                            if curve:
-                                total_line_length += curve.Length
-                    
+                    # Total line length was summed while resolving the picked lines
                     output.print_md("  Total line length: {:.2f} ft".format(total_line_length))
                     
                     if total_line_length > interval_ft:
-                        # Calculate split positions based on TOTAL length
-                        split_positions = []
-                        current_pos = interval_ft
-                        
-                        while current_pos < total_line_length - 0.01:
-                            split_positions.append(current_pos)
-                            current_pos += interval_ft + joint_gap_ft
+                        # Calculate split positions based on TOTAL length, each from its index so no error accumulates
+                        split_step = interval_ft + joint_gap_ft
+                        split_count = int((total_line_length - interval_ft) / split_step) + 1
+                        split_positions = [interval_ft + i * split_step for i in range(split_count)
+                                           if interval_ft + i * split_step < total_line_length - 0.01]
                         
                         output.print_md("  {} split positions calculated".format(len(split_positions)))
                         
@@ -401,12 +444,11 @@ class WallFromLineWindow(Window):
                         all_new_walls = []
                         walls_to_delete = []
                         
-                        for ref in selection:
-                            line_elem = doc.GetElement(ref.ElementId)
-                            if line_elem.Id not in created_walls_map:
+                        for line_element, _ in picked_lines:
+                            if line_element.Id not in created_walls_map:
                                 continue
                             
-                            walls = created_walls_map[line_elem.Id]
+                            walls = created_walls_map[line_element.Id]
                             if not walls or len(walls) == 0:
                                 continue
                             
@@ -421,9 +463,10 @@ class WallFromLineWindow(Window):
                             segment_start = cumulative_length
                             segment_end = cumulative_length + wall_length
                             
-                            # Find splits that fall within this wall segment
-                            splits_in_this_segment = [sp for sp in split_positions 
-                                                     if segment_start < sp < segment_end]
+                            # Find splits that fall within this wall segment, split_positions is ascending
+                            lo = bisect.bisect_right(split_positions, segment_start)
+                            hi = bisect.bisect_left(split_positions, segment_end)
+                            splits_in_this_segment = split_positions[lo:hi]
                             
                             if not splits_in_this_segment:
                                 # No splits in this segment, keep original wall
@@ -434,9 +477,8 @@ class WallFromLineWindow(Window):
                                 output.print_md("    Splitting wall {} at {} positions (gap: {:.2f}\")".format(
                                     wall.Id, len(splits_in_this_segment), gap_inches))
                                 
-                                # Get wall parameters once
-                                wall_height_param = wall.get_Parameter(BuiltInParameter.WALL_USER_HEIGHT_PARAM).AsDouble()
-                                wall_loc_line = wall.get_Parameter(BuiltInParameter.WALL_KEY_REF_PARAM).AsInteger()
+                                # Height and location line are the run values the original wall was created with
+                                wall_loc_line = location_line_value
                                 
                                 # Create sub-segments
                                 sub_walls = []
@@ -461,7 +503,7 @@ class WallFromLineWindow(Window):
                                             seg_curve = Line.CreateBound(seg_start, seg_end)
                                             
                                             seg_wall = Wall.Create(doc, seg_curve, wall_type_id, base_level_id,
-                                                                 wall_height_param, base_offset_ft, "Interior" in wall_location, False)
+                                                                 wall_height, base_offset_ft, flip_wall, False)
                                             
                                             if seg_wall:
                                                 # Copy parameters
@@ -506,7 +548,7 @@ class WallFromLineWindow(Window):
                                                 seg_curve = Line.CreateBound(seg_start, seg_end)
                                             
                                             seg_wall = Wall.Create(doc, seg_curve, wall_type_id, base_level_id,
-                                                                 wall_height_param, base_offset_ft, "Interior" in wall_location, False)
+                                                                 wall_height, base_offset_ft, flip_wall, False)
                                             
                                             if seg_wall:
                                                 loc_param = seg_wall.get_Parameter(BuiltInParameter.WALL_KEY_REF_PARAM)
@@ -542,7 +584,7 @@ class WallFromLineWindow(Window):
                                             seg_curve = Line.CreateBound(seg_start, seg_end)
                                             
                                             seg_wall = Wall.Create(doc, seg_curve, wall_type_id, base_level_id,
-                                                                 wall_height_param, base_offset_ft, "Interior" in wall_location, False)
+                                                                 wall_height, base_offset_ft, flip_wall, False)
                                             
                                             if seg_wall:
                                                 loc_param = seg_wall.get_Parameter(BuiltInParameter.WALL_KEY_REF_PARAM)
@@ -577,7 +619,7 @@ class WallFromLineWindow(Window):
                                                 seg_curve = Line.CreateBound(seg_start, seg_end)
                                             
                                             seg_wall = Wall.Create(doc, seg_curve, wall_type_id, base_level_id,
-                                                                 wall_height_param, base_offset_ft, "Interior" in wall_location, False)
+                                                                 wall_height, base_offset_ft, flip_wall, False)
                                             
                                             if seg_wall:
                                                 loc_param = seg_wall.get_Parameter(BuiltInParameter.WALL_KEY_REF_PARAM)
@@ -602,23 +644,22 @@ class WallFromLineWindow(Window):
                             
                             cumulative_length += wall_length
                         
-                        # Delete original walls that were split
-                        for wall in walls_to_delete:
+                        # Delete original walls that were split, all in one call
+                        if walls_to_delete:
                             try:
-                                doc.Delete(wall.Id)
-                            except:
+                                doc.Delete(List[ElementId]([wall.Id for wall in walls_to_delete]))
+                            except RevitArgumentException:
+                                # An element that is already gone or cannot be deleted
                                 pass
                         
                         total_walls = len(all_new_walls)
                         output.print_md("  Final: {} wall segments created".format(total_walls))
                     else:
                         # Not long enough to split
-                        for walls_list in created_walls_map.values():
-                            total_walls += len(walls_list)
+                        total_walls = created_count
                 else:
                     # No splitting, just count walls
-                    for walls_list in created_walls_map.values():
-                        total_walls += len(walls_list)
+                    total_walls = created_count
                 
                 t.Commit()
             
@@ -632,7 +673,6 @@ class WallFromLineWindow(Window):
             
         except Exception as e:
             output.print_md("❌ Error: {}".format(str(e)))
-            import traceback
             output.print_md("```\n{}\n```".format(traceback.format_exc()))
     
     def SetupEventHandlers(self):
@@ -664,5 +704,4 @@ try:
     window.ShowDialog()
 except Exception as e:
     forms.alert("Error: {}".format(str(e)))
-    import traceback
     output.print_md("```\n{}\n```".format(traceback.format_exc()))
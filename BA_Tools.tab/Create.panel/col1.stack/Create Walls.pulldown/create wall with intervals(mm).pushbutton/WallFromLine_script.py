@@ -19,6 +19,7 @@ clr.AddReference("System.Xaml")
 from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import *
 from Autodesk.Revit.UI.Selection import ObjectType, ISelectionFilter
+from Autodesk.Revit.Exceptions import InvalidOperationException as RevitInvalidOperationException
 from pyrevit import script, forms
 import System
 from System.Windows.Markup import XamlReader
@@ -304,17 +305,18 @@ class LineSelectionFilter(ISelectionFilter):
     """Filter to only allow line selection"""
     def __init__(self, line_category_id):
         self.line_category_id = line_category_id
+        # Compared against every element Revit offers, so unwrap the id once
+        self.line_category_int = line_category_id.IntegerValue
     
     def AllowElement(self, element):
         """Check if element is a line"""
         try:
-            if element.Category and element.Category.Id.IntegerValue == self.line_category_id.IntegerValue:
-                if hasattr(element, 'GeometryCurve'):
-                    curve = element.GeometryCurve
-                    if curve:
-                        return True
-            return False
-        except:
+            # Category mismatch is the common reject, test it before touching the geometry
+            category = element.Category
+            if not category or category.Id.IntegerValue != self.line_category_int:
+                return False
+            return getattr(element, 'GeometryCurve', None) is not None
+        except (AttributeError, RevitInvalidOperationException):
             return False
     
     def AllowReference(self, ref, point):
@@ -397,11 +399,13 @@ class WallFromLineWindow(Window):
     
     def LoadWallTypes(self):
         try:
-            wall_types = FilteredElementCollector(doc).OfClass(WallType).ToElements()
-            for wt in sorted(wall_types, key=lambda x: x.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_AND_TYPE_NAMES_PARAM).AsString()):
-                wall_name = wt.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_AND_TYPE_NAMES_PARAM).AsString()
+            # Read each type name once, then sort the (name, id) pairs
+            wall_types = [(wt.get_Parameter(BuiltInParameter.SYMBOL_FAMILY_AND_TYPE_NAMES_PARAM).AsString(), wt.Id)
+                          for wt in FilteredElementCollector(doc).OfClass(WallType)]
+            wall_types.sort(key=lambda pair: pair[0])
+            for wall_name, wall_type_id in wall_types:
                 self.cmbWallType.Items.Add(wall_name)
-                self.wall_types[wall_name] = wt.Id
+                self.wall_types[wall_name] = wall_type_id
             if self.cmbWallType.Items.Count > 0:
                 self.cmbWallType.SelectedIndex = 0
         except Exception as e: